@@ -252,6 +252,11 @@ class GameManager:
             import traceback
             raise e
 
+    def simulate_rounds(self, match_id: str, count: int) -> List[dict]:
+        """Simulate the next count rounds of the match, returning each round's result."""
+        self._get_match(match_id)
+        return [self.simulate_next_round(match_id) for _ in range(count)]
+
     def get_round_state(self, match_id: str, round_number: int) -> dict:
         """Get the state of a specific round."""
         try:
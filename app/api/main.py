@@ -1,4 +1,4 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from typing import Dict, List, Optional
 import uuid
@@ -57,6 +57,16 @@ async def simulate_next_round(match_id: str):
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@app.post("/matches/{match_id}/rounds/batch", response_model=List[RoundResponse])
+async def simulate_rounds(match_id: str, n: int = Query(..., ge=1, le=25)):
+    """Simulate the next n rounds of the match in one request."""
+    try:
+        return game_manager.simulate_rounds(match_id, n)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Match not found")
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.get("/matches/{match_id}/rounds/{round_number}", response_model=RoundStateResponse)
 async def get_round_state(match_id: str, round_number: int):
     """Get the state of a specific round."""
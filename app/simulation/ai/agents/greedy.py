@@ -24,18 +24,14 @@ class GreedyAgent(BaseAgent):
         """
         Decide the next action based on current observation and personality traits.
         """
-        # Base action without buy field
-        action = {'action_type': 'idle'}
-        
-        # Add buy field only in buy phase
-        if observation['phase'] == 'buy':
-            action['buy'] = {}
+        in_buy_phase = observation['phase'] == 'buy'
         
+        # Dead agents idle; the buy field is only present in buy phase
         if not observation['alive']:
-            return action
+            return {'action_type': 'idle', 'buy': {}} if in_buy_phase else {'action_type': 'idle'}
             
         # Buy phase logic
-        if observation['phase'] == 'buy':
+        if in_buy_phase:
             return self._decide_buy(observation)
             
         # Combat phase logic
@@ -1,4 +1,6 @@
-from typing import Dict, List, Optional, Type
+from typing import Dict, List, Optional, Tuple, Type
+from collections import defaultdict
+import os
 import random
 from pathlib import Path
 import json
@@ -8,6 +10,10 @@ from ..agents.greedy import GreedyAgent
 from ..agents.rl_agent import RLAgent
 from ..agents.pro_agent import ProAgent
 
+# Parsed config files keyed by absolute path, with the (mtime_ns, size) they were
+# read at; shared by every pool
+_config_cache: Dict[str, Tuple[int, int, Dict]] = {}
+
 class AgentPool:
     """
     Manages a pool of agents for production use.
@@ -27,6 +33,12 @@ class AgentPool:
             'sentinel': [],
             'initiator': []
         }
+        # The same agents per role, bucketed by int(skill_level * 10) with their
+        # position in the pool. Reusable agents are within 0.1 of the requested
+        # skill, so only the neighbouring buckets need checking.
+        self._skill_buckets: Dict[str, Dict[int, List[Tuple[int, BaseAgent]]]] = {
+            role: defaultdict(list) for role in self.agents
+        }
         
         # Register default agent types
         self.agent_classes: Dict[str, Type[BaseAgent]] = {
@@ -96,8 +108,15 @@ class AgentPool:
             raise ValueError(f"Invalid role: {role}")
             
         # First try to find an existing agent with matching criteria
+        bucket = int(skill_level * 10)
+        buckets = self._skill_buckets[role]
+        candidates = []
+        for key in (bucket - 1, bucket, bucket + 1):
+            candidates.extend(buckets.get(key, ()))
+        # Pick in pool order so the random choice is the same as over the full list
+        candidates.sort(key=lambda entry: entry[0])
         matching_agents = [
-            agent for agent in self.agents[role]
+            agent for _, agent in candidates
             if abs(agent.skill_level - skill_level) < 0.1 and
             (agent_type is None or agent.agent_type == agent_type)
         ]
@@ -142,6 +161,7 @@ class AgentPool:
         agent = self.agent_classes[agent_type](config)
         
         # Add to pool
+        self._skill_buckets[role][int(skill_level * 10)].append((len(self.agents[role]), agent))
         self.agents[role].append(agent)
         
         return agent
@@ -202,12 +222,22 @@ class AgentPool:
     def _load_config(self, config_path: str) -> None:
         """Load agent configurations from a JSON file."""
         try:
-            with open(config_path) as f:
-                config = json.load(f)
+            # Reuse the parsed file while it is unchanged on disk
+            stat = os.stat(config_path)
+            path = os.path.abspath(config_path)
+            cached = _config_cache.get(path)
+            if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+                config = cached[2]
+            else:
+                with open(config_path) as f:
+                    config = json.load(f)
+                _config_cache[path] = (stat.st_mtime_ns, stat.st_size, config)
             
-            # Load default personalities
+            # Load default personalities, copied so pools never share the cached dicts
             if "default_personalities" in config:
-                self.default_personalities.update(config["default_personalities"])
+                self.default_personalities.update(
+                    (role, dict(traits)) for role, traits in config["default_personalities"].items()
+                )
             
             # Load skill thresholds
             if "skill_thresholds" in config:
@@ -149,53 +149,58 @@ class AbilityInstance:
             return 0.0
         return max(0.0, self.end_time - current_time)
         
-    def apply_effect(self, game_state: Optional[Any], players: List[Any]) -> None:
-        """Apply ability effect to players."""
-        if not self.current_position3d or not self.is_active:
-            return
-            
+    def players_in_radius(self, players: List[Any], alive_only: bool = True) -> List[Any]:
+        """Get the players within the effect radius of the ability's current position."""
         x, y, z = self.current_position3d
-        self.effect_applied = False
-        
+        # Compare squared distances; membership needs no sqrt
+        radius_sq = self.definition.effect_radius * self.definition.effect_radius
+        in_range = []
         for player in players:
-            if not player.is_alive:
+            if alive_only and not player.is_alive:
                 continue
-                
-            # Get player position
             px, py, pz = player.location
-            
-            # Calculate distance to player
             dx = x - px
             dy = y - py
             dz = z - pz
-            dist = math.sqrt(dx*dx + dy*dy + dz*dz)
+            if dx*dx + dy*dy + dz*dz <= radius_sq:
+                in_range.append(player)
+        return in_range
+    
+    def apply_effect(self, game_state: Optional[Any], players: List[Any]) -> None:
+        """Apply ability effect to players."""
+        if not self.current_position3d or not self.is_active:
+            return
             
-            # Check if player is in range
-            if dist <= self.definition.effect_radius:  # Use effect_radius
-                self.affected_players.add(player.id)
+        self.effect_applied = False
+        definition = self.definition
+        damage = definition.damage
+        healing = definition.healing
+        
+        for player in self.players_in_radius(players):
+            self.affected_players.add(player.id)
                 
-                # Apply damage
-                if self.definition.damage > 0:
-                    if hasattr(player, 'apply_damage'):
-                        player.apply_damage(int(self.definition.damage))
+            # Apply damage
+            if damage > 0:
+                if hasattr(player, 'apply_damage'):
+                    player.apply_damage(int(damage))
+                else:
+                    if player.armor > 0:
+                        armor_damage = min(player.armor, damage * 0.5)
+                        player.armor -= armor_damage
+                        player.health -= damage - armor_damage
                     else:
-                        if player.armor > 0:
-                            armor_damage = min(player.armor, self.definition.damage * 0.5)
-                            player.armor -= armor_damage
-                            player.health -= self.definition.damage - armor_damage
-                        else:
-                            player.health -= self.definition.damage
+                        player.health -= damage
                             
-                # Apply healing
-                if self.definition.healing > 0:
-                    player.health = min(player.health + int(self.definition.healing), 100)
+            # Apply healing
+            if healing > 0:
+                player.health = min(player.health + int(healing), 100)
                     
-                # Apply status effects
-                for status in self.definition.status_effects:
-                    if status not in list(player.status_effects.keys()):
-                        player.status_effects[status] = self.definition.duration
+            # Apply status effects
+            for status in definition.status_effects:
+                if status not in player.status_effects:
+                    player.status_effects[status] = definition.duration
                         
-                self.effect_applied = True
+            self.effect_applied = True
 
 @dataclass
 class ProjectileAbilityInstance(AbilityInstance):
@@ -273,22 +278,22 @@ class AreaAbilityInstance(AbilityInstance):
         
         # Continue applying effect to players in area
         if self.current_position3d:
-            x, y, z = self.current_position3d
-            for player in players:
-                px, py, pz = player.location
-                dist = math.sqrt((px - x)**2 + (py - y)**2 + (pz - z)**2)
-                if dist <= self.definition.effect_radius:
-                    # Apply continuous effects
-                    if self.definition.damage > 0:
-                        player.apply_damage(int(self.definition.damage * time_step))
-                    if self.definition.healing > 0:
-                        player.health = min(100, player.health + int(self.definition.healing * time_step))
-                    # Add to affected players
-                    self.affected_players.add(player.id)
-                    # Apply status effects
-                    for status in self.definition.status_effects:
-                        if status not in list(player.status_effects.keys()):
-                            player.status_effects[status] = self.definition.duration
+            # Per-tick amounts are the same for every player in the area
+            definition = self.definition
+            tick_damage = int(definition.damage * time_step) if definition.damage > 0 else 0
+            tick_healing = int(definition.healing * time_step) if definition.healing > 0 else 0
+            for player in self.players_in_radius(players, alive_only=False):
+                # Apply continuous effects
+                if definition.damage > 0:
+                    player.apply_damage(tick_damage)
+                if definition.healing > 0:
+                    player.health = min(100, player.health + tick_healing)
+                # Add to affected players
+                self.affected_players.add(player.id)
+                # Apply status effects
+                for status in definition.status_effects:
+                    if status not in player.status_effects:
+                        player.status_effects[status] = definition.duration
 
 @dataclass
 class FlashAbilityInstance(ProjectileAbilityInstance):
@@ -301,24 +306,33 @@ class FlashAbilityInstance(ProjectileAbilityInstance):
         # Use self as the source for FOV calculation
         self.location = self.current_position3d  # Ensure self has a location attribute
         self.direction = 0  # Flash has no facing, so use 0 (360 FOV)
-        visible_players = game_map.calculate_player_fov(self, players, fov_angle=360.0, max_distance=self.definition.effect_radius)
-        for player in visible_players:
+        # Facing and range are cheap to check, so do them first; only players who
+        # would be blinded pay for the line-of-sight raycast in the FOV query
+        x, y, z = self.current_position3d
+        radius = self.definition.effect_radius
+        radius_sq = radius * radius
+        facing_players = []
+        for player in players:
             if not player.is_alive:
                 continue
-            x, y, z = self.current_position3d
             px, py, pz = player.location
             dx = x - px
             dy = y - py
             dz = z - pz
-            length = math.sqrt(dx*dx + dy*dy + dz*dz)
-            if length == 0:
+            dist_sq = dx*dx + dy*dy + dz*dz
+            if dist_sq == 0 or dist_sq > radius_sq:
                 continue
-            dx, dy, dz = dx/length, dy/length, dz/length
+            # The player faces the flash when the cosine to it exceeds 0.7. Squaring
+            # both sides of dot / |d| > 0.7 (dot positive) avoids the sqrt and divide
             vx, vy, vz = player.view_direction
             dot = dx*vx + dy*vy + dz*vz
-            if dot > 0.7:
-                self.affected_players.add(player.id)
-                player.status_effects["flashed"] = self.definition.duration
+            if dot > 0 and dot*dot > 0.49 * dist_sq:
+                facing_players.append(player)
+        visible_players = game_map.calculate_player_fov(self, facing_players, fov_angle=360.0, max_distance=radius)
+        duration = self.definition.duration
+        for player in visible_players:
+            self.affected_players.add(player.id)
+            player.status_effects["flashed"] = duration
 
     def update(self, time_step: float, current_time: float, game_map: Optional[Any], players: List[Any]) -> None:
         """Update flash state."""
@@ -332,7 +346,7 @@ class FlashAbilityInstance(ProjectileAbilityInstance):
         if not self.is_active:
             for player_id in self.affected_players:
                 player = self.get_player_by_id(player_id)
-                if player and "flashed" in list(player.status_effects.keys()):
+                if player and "flashed" in player.status_effects:
                     del player.status_effects["flashed"]
 
 @dataclass
@@ -350,29 +364,15 @@ class SmokeAbilityInstance(ProjectileAbilityInstance):
         if not self.current_position3d or not self.is_active:
             return
             
-        x, y, z = self.current_position3d
         self.effect_applied = False
         self.affected_players.clear()  # Clear affected players before applying effect
         
-        for player in players:
-            if not player.is_alive:
-                continue
-                
-            # Get player position
-            px, py, pz = player.location
-            
-            # Calculate distance to player
-            dx = x - px
-            dy = y - py
-            dz = z - pz
-            dist = math.sqrt(dx*dx + dy*dy + dz*dz)
-            
-            # Check if player is in range
-            if dist <= self.definition.effect_radius:  # Use effect_radius
-                self.affected_players.add(player.id)
-                if "smoked" not in list(player.status_effects.keys()):
-                    player.status_effects["smoked"] = self.definition.duration
-                self.effect_applied = True
+        duration = self.definition.duration
+        for player in self.players_in_radius(players):
+            self.affected_players.add(player.id)
+            if "smoked" not in player.status_effects:
+                player.status_effects["smoked"] = duration
+            self.effect_applied = True
                 
     def update(self, time_step: float, current_time: float, game_map: Optional[Any], players: List[Any]) -> None:
         """Update smoke state."""
@@ -386,7 +386,7 @@ class SmokeAbilityInstance(ProjectileAbilityInstance):
         if not self.is_active:
             for player_id in self.affected_players:
                 player = self.get_player_by_id(player_id)
-                if player and "smoked" in list(player.status_effects.keys()):
+                if player and "smoked" in player.status_effects:
                     del player.status_effects["smoked"]
 
 @dataclass
@@ -404,42 +404,30 @@ class MollyAbilityInstance(ProjectileAbilityInstance):
         if not self.current_position3d or not self.is_active:
             return
             
-        x, y, z = self.current_position3d
         self.effect_applied = False
         self.affected_players.clear()  # Clear affected players before applying effect
         
-        for player in players:
-            if not player.is_alive:
-                continue
+        duration = self.definition.duration
+        damage = self.definition.damage
+        # Armor takes 50% of damage; the split only depends on the definition
+        armor_share = damage * 0.5
+        for player in self.players_in_radius(players):
+            self.affected_players.add(player.id)
+            if "burning" not in player.status_effects:
+                player.status_effects["burning"] = duration
                 
-            # Get player position
-            px, py, pz = player.location
-            
-            # Calculate distance to player
-            dx = x - px
-            dy = y - py
-            dz = z - pz
-            dist = math.sqrt(dx*dx + dy*dy + dz*dz)
-            
-            # Check if player is in range
-            if dist <= self.definition.effect_radius:  # Use effect_radius
-                self.affected_players.add(player.id)
-                if "burning" not in list(player.status_effects.keys()):
-                    player.status_effects["burning"] = self.definition.duration
-                
-                # Apply damage
-                damage = self.definition.damage  # Second param is damage
-                if hasattr(player, 'apply_damage'):
-                    player.apply_damage(int(damage))
+            # Apply damage
+            if hasattr(player, 'apply_damage'):
+                player.apply_damage(int(damage))
+            else:
+                if player.armor > 0:
+                    armor_damage = min(player.armor, armor_share)
+                    player.armor = max(0, player.armor - armor_damage)  # Ensure armor doesn't go negative
+                    player.health = max(0, player.health - (damage - armor_damage))  # Remaining damage to health
                 else:
-                    if player.armor > 0:
-                        armor_damage = min(player.armor, damage * 0.5)  # Armor takes 50% of damage
-                        player.armor = max(0, player.armor - armor_damage)  # Ensure armor doesn't go negative
-                        player.health = max(0, player.health - (damage - armor_damage))  # Remaining damage to health
-                    else:
-                        player.health = max(0, player.health - damage)  # Full damage to health
+                    player.health = max(0, player.health - damage)  # Full damage to health
                     
-                self.effect_applied = True
+            self.effect_applied = True
                 
     def update(self, time_step: float, current_time: float, game_map: Optional[Any], players: List[Player]) -> None:
         """Update molly state."""
@@ -453,7 +441,7 @@ class MollyAbilityInstance(ProjectileAbilityInstance):
         if not self.is_active:
             for player in players:
                 if player.id in self.affected_players:
-                    if "burning" in list(player.status_effects.keys()):
+                    if "burning" in player.status_effects:
                         del player.status_effects["burning"]
 
 @dataclass
@@ -463,52 +451,38 @@ class ReconAbilityInstance(ProjectileAbilityInstance):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.pulse_timer = 0.0
+        # Definitions don't change after creation, so read the interval once
+        self.pulse_interval = self.definition.properties.get('pulse_interval', 1.0)
     
     def apply_effect(self, game_state: Optional[Any], players: List[Any]) -> None:
         """Apply recon effect to players in range."""
         if not self.current_position3d or not self.is_active:
             return
             
-        x, y, z = self.current_position3d
         self.effect_applied = False
         
-        for player in players:
-            if not player.is_alive:
-                continue
-                
-            # Get player position
-            px, py, pz = player.location
-            
-            # Calculate distance to player
-            dx = x - px
-            dy = y - py
-            dz = z - pz
-            dist = math.sqrt(dx*dx + dy*dy + dz*dz)
-            
-            # Check if player is in range
-            if dist <= self.definition.effect_radius:  # Use effect_radius
-                self.affected_players.add(player.id)
-                if "revealed" not in list(player.status_effects.keys()):
-                    player.status_effects["revealed"] = self.definition.duration
-                self.effect_applied = True
+        duration = self.definition.duration
+        for player in self.players_in_radius(players):
+            self.affected_players.add(player.id)
+            if "revealed" not in player.status_effects:
+                player.status_effects["revealed"] = duration
+            self.effect_applied = True
                 
     def update(self, time_step: float, current_time: float, game_map: Optional[Any], players: List[Any]) -> None:
         """Update recon state."""
         super().update(time_step, current_time, game_map, players)
         
         if self.is_active and current_time < self.end_time:
-            # Pulse interval
-            interval = self.definition.properties.get('pulse_interval', 1.0)
             self.pulse_timer += time_step
-            if self.pulse_timer >= interval:
-                self.pulse_timer -= interval
+            if self.pulse_timer >= self.pulse_interval:
+                self.pulse_timer -= self.pulse_interval
                 self.apply_effect(game_map, players)
         
         # If recon is no longer active, remove effects from affected players
         if not self.is_active:
             for player_id in self.affected_players:
                 player = self.get_player_by_id(player_id)
-                if player and "revealed" in list(player.status_effects.keys()):
+                if player and "revealed" in player.status_effects:
                     del player.status_effects["revealed"]
 
 # Standard ability definitions
@@ -629,6 +603,10 @@ STANDARD_ABILITIES = {
     )
 }
 
+# The standard flash and smoke definitions, shared by every instance that uses them
+FLASH_DEF = STANDARD_ABILITIES["flash"]
+SMOKE_DEF = STANDARD_ABILITIES["smoke"]
+
 # Helper functions to create common ability definitions
 def create_smoke_ability(name: str, radius: float = 5.0, duration: float = 15.0) -> AbilityDefinition:
     """Create a smoke ability definition."""
@@ -2,8 +2,12 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import List, Dict, Tuple, Optional, Any, TYPE_CHECKING
 import json
+import heapq
+from array import array
+from collections import OrderedDict
 import random
 import math
+import numpy as np
 from app.simulation.models.map_pathfinding import NavigationMesh, PathFinder, CollisionDetector
 try:
     import pygame
@@ -495,6 +499,175 @@ class StairsBoundary(MapBoundary):
         # Return elevation for this step
         return self.z + step_num * self.step_height
 
+class SpatialGrid:
+    """Uniform grid that buckets boundaries by the cells their footprint overlaps."""
+    
+    def __init__(self, boundaries: List[MapBoundary], cell_size: float = 2.0):
+        """
+        Build the grid.
+        
+        Args:
+            boundaries: Boundaries to insert, in the order queries should return them
+            cell_size: Edge length of a grid cell in game units
+        """
+        self.cell_size = cell_size
+        self.buckets: Dict[Tuple[int, int], List[MapBoundary]] = {}
+        for boundary in boundaries:
+            self.insert(boundary)
+    
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+    
+    def insert(self, boundary: MapBoundary) -> None:
+        """Add a boundary to every cell its footprint (edges included) touches."""
+        min_cx, min_cy = self._cell(boundary.x, boundary.y)
+        max_cx, max_cy = self._cell(boundary.x + boundary.width, boundary.y + boundary.height)
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                self.buckets.setdefault((cx, cy), []).append(boundary)
+    
+    def query(self, x: float, y: float) -> List[MapBoundary]:
+        """Get boundaries that may contain the point, in insertion order."""
+        return self.buckets.get(self._cell(x, y), [])
+    
+    def query_rect(self, min_x: float, min_y: float, max_x: float, max_y: float) -> List[MapBoundary]:
+        """Get boundaries that may overlap the rectangle, without duplicates."""
+        min_cx, min_cy = self._cell(min_x, min_y)
+        max_cx, max_cy = self._cell(max_x, max_y)
+        if min_cx == max_cx and min_cy == max_cy:
+            return self.buckets.get((min_cx, min_cy), [])
+        hits = [self.buckets[cell] for cell in
+                ((cx, cy) for cx in range(min_cx, max_cx + 1) for cy in range(min_cy, max_cy + 1))
+                if cell in self.buckets]
+        if len(hits) <= 1:
+            return hits[0] if hits else []
+        # Boundaries hash by identity, so this drops entries spanning several cells
+        return list(dict.fromkeys(boundary for bucket in hits for boundary in bucket))
+
+# Most recent find_path_3d results kept per map
+_PATH_CACHE_SIZE = 256
+
+# Most recent get_elevation_at_position results kept per map
+_ELEVATION_CACHE_SIZE = 4096
+
+# 8-connected neighbor offsets with their horizontal step cost
+_NEIGHBOR_STEPS = (
+    (-1, 0, 1.0), (1, 0, 1.0), (0, -1, 1.0), (0, 1, 1.0),
+    (-1, -1, math.sqrt(2)), (1, 1, math.sqrt(2)), (-1, 1, math.sqrt(2)), (1, -1, math.sqrt(2)),
+)
+
+def _astar_grid(neighbors: List[Tuple[Tuple[int, int, float, float], ...]],
+                width: int, height: int,
+                stair_mask: bytearray, ramp_mask: bytearray,
+                start: Tuple[int, int, float], goal: Tuple[int, int, float],
+                start_cell_z: float, goal_cell_z: float,
+                max_jump_height: float, max_iterations: int = 5000) -> List[Tuple[float, float, float]]:
+    """
+    A* over an 8-connected grid of cells with per-cell elevations.
+    
+    Everything the search reads is passed in as flat lists and bytearrays, so the
+    loop does no attribute lookups or calls into map objects.
+    
+    Args:
+        neighbors: Walkable (x, y, elevation, step_cost) neighbors per grid point (y * width + x)
+        width: Grid width in cells
+        height: Grid height in cells
+        stair_mask: 1 per grid point (y * width + x) on stairs
+        ramp_mask: 1 per grid point (y * width + x) on a ramp
+        start: Start cell (x, y, z)
+        goal: Goal cell (x, y, z)
+        start_cell_z: Grid elevation of the start cell
+        goal_cell_z: Grid elevation of the goal cell
+        max_jump_height: Highest climb allowed off stairs and ramps
+        max_iterations: Expansion budget before giving up
+        
+    Returns:
+        Cell-center waypoints from start to goal, or an empty list if unreachable
+    """
+    start_x, start_y, start_z = start
+    goal_x, goal_y, goal_z = goal
+    
+    def heuristic(x: int, y: int, z: float) -> float:
+        # Octile distance plus the remaining climb/drop
+        dx = abs(goal_x - x)
+        dy = abs(goal_y - y)
+        return max(dx, dy) + 0.414 * min(dx, dy) + abs(goal_z - z)
+    
+    # Every step lands on the neighbor cell's elevation, so a state's z is fixed by
+    # its cell and states are keyed by cell alone (y * width + x). The one exception
+    # is a start z off the grid elevation, which gets the extra key `cells`.
+    cells = width * height
+    start_cell = start_y * width + start_x
+    start_key = start_cell if start_z == start_cell_z else cells
+    if goal_z == goal_cell_z:
+        goal_key = goal_y * width + goal_x
+    elif start_key == cells and goal_z == start_z and (goal_x, goal_y) == (start_x, start_y):
+        goal_key = start_key
+    else:
+        # No state stands at the goal z, so don't search
+        return []
+    # Flat per-state bookkeeping: best known cost and parent state (-1 = none)
+    g_score = [math.inf] * (cells + 1)
+    came_from = array('i', [-1]) * (cells + 1)
+    g_score[start_key] = 0.0
+    # A* setup: heap of (f_score, insertion counter, key, x, y, z); the counter
+    # breaks ties so the trailing fields are never compared
+    counter = 0
+    frontier = [(heuristic(start_x, start_y, start_z), counter, start_key, start_x, start_y, start_z)]
+    iterations = 0
+    # Loop-invariant lookups bound to locals
+    heappop, heappush = heapq.heappop, heapq.heappush
+    # Perform A*
+    while frontier and iterations < max_iterations:
+        f, _, current, cx, cy, cz = heappop(frontier)
+        current_g = g_score[current]
+        # Skip stale heap entries superseded by a cheaper route
+        if f > current_g + heuristic(cx, cy, cz):
+            continue
+        iterations += 1
+        # Goal reached?
+        if (cx, cy) == (goal_x, goal_y) and abs(cz - goal_z) < 0.1:
+            break
+        # Standing on stairs or a ramp allows a bigger climb to any neighbor
+        cell = cy * width + cx
+        climb = 3.0 if stair_mask[cell] or ramp_mask[cell] else max_jump_height
+        # Explore neighbors; the table already dropped out-of-bounds and unwalkable
+        # cells (neighbors always stand on the terrain, so walkability is per cell)
+        for nx, ny, nz, step_cost in neighbors[cell]:
+            # Going down or level is always allowed; going up is limited by the climb
+            if nz - cz >= 0.1 and nz - cz > climb:
+                continue
+            neighbor = ny * width + nx
+            tentative_g = current_g + step_cost + abs(nz - cz)
+            # Enqueue if this is the cheapest route found so far
+            if tentative_g < g_score[neighbor]:
+                neighbor_f = tentative_g + heuristic(nx, ny, nz)
+                # Once the goal is enqueued, anything that can't beat its cost would
+                # only be popped after it, so stop growing the heap with it
+                if neighbor_f >= g_score[goal_key]:
+                    continue
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative_g
+                counter += 1
+                heappush(frontier, (neighbor_f, counter, neighbor, nx, ny, nz))
+    # Check for failure
+    if iterations >= max_iterations or g_score[goal_key] == math.inf:
+        return []
+    # Reconstruct the path; a cell's z is its elevation as listed in the parent's
+    # neighbor entries, and the start state keeps the start z
+    path = []
+    key = goal_key
+    while key != start_key:
+        parent = came_from[key]
+        x, y = key % width, key // width
+        parent_cell = start_cell if parent == cells else parent
+        z = next(nz for nx, ny, nz, _ in neighbors[parent_cell] if nx == x and ny == y)
+        path.append((x + 0.5, y + 0.5, z))
+        key = parent
+    path.append((start_x + 0.5, start_y + 0.5, start_z))
+    path.reverse()
+    return path
+
 class Map:
     """Represents a game map with boundaries and areas."""
     
@@ -526,6 +699,8 @@ class Map:
         self.nav_mesh = None
         self.pathfinder = None
         self.collision_detector = None
+        # Cached NumPy geometry for vectorized elevation queries
+        self._geometry_cache: Optional[Dict[str, Any]] = None
     
     @classmethod
     def from_json(cls, data) -> 'Map':
@@ -651,6 +826,31 @@ class Map:
         Returns:
             float: The elevation value at the position
         """
+        # Moving players query continuous positions that rarely repeat, so only
+        # whole-number points (grid searches, waypoints, patrol points) are
+        # memoized; the memo is dropped with the other derived geometry
+        if x % 1 or y % 1:
+            return self._compute_elevation_at_position(x, y)
+        elevation_cache = self._cached_geometry("elevation_cache", OrderedDict)
+        key = (x, y)
+        elevation = elevation_cache.get(key)
+        if elevation is not None:
+            elevation_cache.move_to_end(key)
+            return elevation
+        elevation = self._compute_elevation_at_position(x, y)
+        elevation_cache[key] = elevation
+        if len(elevation_cache) > _ELEVATION_CACHE_SIZE:
+            elevation_cache.popitem(last=False)
+        return elevation
+    
+    def _compute_elevation_at_position(self, x: float, y: float) -> float:
+        grids = self._get_spatial_grids()
+        
+        # Ramps, then stairs, override everything else
+        for surface in grids["surfaces"].query(x, y):
+            if surface.x <= x < surface.x + surface.width and surface.y <= y < surface.y + surface.height:
+                return surface.get_elevation_at_point(x, y)
+        
         # Start with default elevation 0
         elevation = 0.0
         
@@ -660,20 +860,200 @@ class Map:
                 elevation = area.elevation
                 break
         
-        # Check for ramps directly in the ramps collection
-        for ramp in self.ramps.values():
-            if ramp.x <= x < ramp.x + ramp.width and ramp.y <= y < ramp.y + ramp.height:
-                return ramp.get_elevation_at_point(x, y)
-        # Check for stairs directly in the stairs collection
-        for stair in self.stairs.values():
-            if stair.x <= x < stair.x + stair.width and stair.y <= y < stair.y + stair.height:
-                return stair.get_elevation_at_point(x, y)
         # Override with walls/objects elevation if higher
-        for boundary in list(self.walls.values()) + list(self.objects.values()):
-            if (boundary.x <= x < boundary.x + boundary.width and 
-                boundary.y <= y < boundary.y + boundary.height and 
-                boundary.z > elevation):
-                elevation = boundary.z
+        for boundaries in (grids["walls"].query(x, y), grids["objects"].query(x, y)):
+            for boundary in boundaries:
+                if (boundary.x <= x < boundary.x + boundary.width and 
+                    boundary.y <= y < boundary.y + boundary.height and 
+                    boundary.z > elevation):
+                    elevation = boundary.z
+        return elevation
+    
+    def invalidate_geometry_cache(self) -> None:
+        """Drop cached geometry arrays, e.g. after editing a boundary in place."""
+        self._geometry_cache = None
+    
+    def _cached_geometry(self, key: str, build) -> Any:
+        """
+        Get a derived geometry structure, building it on first use.
+        
+        Everything cached here is discarded by add_area/add_boundary and when the
+        number of boundaries changes; other edits to an existing boundary require
+        invalidate_geometry_cache().
+        """
+        signature = (len(self.areas), len(self.walls), len(self.objects), len(self.ramps), len(self.stairs))
+        if self._geometry_cache is None or self._geometry_cache["signature"] != signature:
+            self._geometry_cache = {"signature": signature}
+        if key not in self._geometry_cache:
+            self._geometry_cache[key] = build()
+        return self._geometry_cache[key]
+    
+    def _get_spatial_grids(self) -> Dict[str, SpatialGrid]:
+        """Get spatial grids over walls, objects and ramp/stair surfaces."""
+        return self._cached_geometry("spatial_grids", lambda: {
+            "walls": SpatialGrid(list(self.walls.values())),
+            "objects": SpatialGrid(list(self.objects.values())),
+            # Ramps before stairs, matching get_elevation_at_position precedence
+            "surfaces": SpatialGrid(list(self.ramps.values()) + list(self.stairs.values())),
+        })
+    
+    def _get_raycast_boxes(self) -> List[Tuple[MapBoundary, float, float, float, float, float, float]]:
+        """Get (boundary, min_x, min_y, min_z, max_x, max_y, max_z) for every wall, then every object."""
+        return self._cached_geometry("raycast_boxes", lambda: [
+            (b, b.x, b.y, b.z, b.x + b.width, b.y + b.height, b.z + b.height_z)
+            for b in list(self.walls.values()) + list(self.objects.values())
+        ])
+    
+    def get_elevation_grid(self) -> np.ndarray:
+        """
+        Get the elevation at every integer grid point, indexed [x, y].
+        
+        Values match get_elevation_at_position exactly, so grid-based searches
+        can read them instead of querying the map geometry per cell.
+        """
+        return self._cached_geometry("elevation_grid", self._build_elevation_grid)
+    
+    def _build_elevation_grid(self) -> np.ndarray:
+        xs, ys = np.meshgrid(np.arange(int(self.width)), np.arange(int(self.height)), indexing="ij")
+        return self.get_elevations_at_positions(xs.ravel(), ys.ravel()).reshape(xs.shape)
+    
+    def get_surface_masks(self) -> Dict[str, bytearray]:
+        """
+        Get occupancy masks marking the grid points covered by stairs and ramps.
+        
+        Each mask holds one byte per integer grid point, indexed y * width + x,
+        set to 1 when the point lies on a footprint (edges included).
+        """
+        return self._cached_geometry("surface_masks", self._build_surface_masks)
+    
+    def _build_surface_masks(self) -> Dict[str, bytearray]:
+        width, height = int(self.width), int(self.height)
+        
+        def rasterize(boundaries) -> bytearray:
+            mask = bytearray(width * height)
+            for b in boundaries:
+                for y in range(max(0, math.ceil(b.y)), min(height - 1, math.floor(b.y + b.height)) + 1):
+                    row = y * width
+                    for x in range(max(0, math.ceil(b.x)), min(width - 1, math.floor(b.x + b.width)) + 1):
+                        mask[row + x] = 1
+            return mask
+        
+        return {"stairs": rasterize(self.stairs.values()), "ramps": rasterize(self.ramps.values())}
+    
+    def get_walkable_mask(self, radius: float = 0.5, height: float = 1.0) -> bytearray:
+        """
+        Get a mask of the grid points where a player of the given size can stand.
+        
+        One byte per integer grid point, indexed y * width + x, set to 1 when
+        is_valid_position holds at the terrain elevation there.
+        """
+        return self._cached_geometry(f"walkable_{radius}_{height}",
+                                     lambda: self._build_walkable_mask(radius, height))
+    
+    def _build_walkable_mask(self, radius: float, height: float) -> bytearray:
+        elevations = self.get_elevation_grid().tolist()
+        width, grid_height = int(self.width), int(self.height)
+        mask = bytearray(width * grid_height)
+        for y in range(grid_height):
+            for x in range(width):
+                mask[y * width + x] = self.is_valid_position(x, y, elevations[x][y], radius, height)
+        return mask
+    
+    def get_neighbor_table(self, radius: float = 0.5, height: float = 1.0) -> List[Tuple[Tuple[int, int, float, float], ...]]:
+        """
+        Get the walkable 8-connected neighbors of every integer grid point.
+        
+        Indexed y * width + x; each entry holds (x, y, elevation, step_cost) for
+        the in-bounds neighbors in the walkable mask, in _NEIGHBOR_STEPS order.
+        Diagonal neighbors are only listed when both cardinal cells they pass
+        between are walkable, so paths never cut through a wall corner.
+        """
+        return self._cached_geometry(f"neighbors_{radius}_{height}",
+                                     lambda: self._build_neighbor_table(radius, height))
+    
+    def _build_neighbor_table(self, radius: float, height: float) -> List[Tuple[Tuple[int, int, float, float], ...]]:
+        width, grid_height = int(self.width), int(self.height)
+        elevations = self.get_elevation_grid().tolist()
+        walkable = np.frombuffer(self.get_walkable_mask(radius, height), dtype=np.uint8).reshape(grid_height, width)
+        # Pad with unwalkable cells so shifted views also cover the bounds check
+        padded = np.pad(walkable.astype(bool), 1)
+        table = [[] for _ in range(width * grid_height)]
+        
+        def shifted(dx: int, dy: int) -> np.ndarray:
+            # shifted(dx, dy)[y, x] is the walkability of cell (x + dx, y + dy)
+            return padded[1 + dy:1 + dy + grid_height, 1 + dx:1 + dx + width]
+        
+        for dx, dy, step_cost in _NEIGHBOR_STEPS:
+            passable = shifted(dx, dy)
+            if dx and dy:
+                passable = passable & shifted(dx, 0) & shifted(0, dy)
+            ys, xs = np.nonzero(passable)
+            for y, x in zip(ys.tolist(), xs.tolist()):
+                nx, ny = x + dx, y + dy
+                table[y * width + x].append((nx, ny, elevations[nx][ny], step_cost))
+        return [tuple(entries) for entries in table]
+    
+    def _get_elevation_geometry(self) -> Dict[str, Any]:
+        """Get map footprints packed into NumPy arrays for vectorized elevation queries."""
+        return self._cached_geometry("elevation_arrays", self._build_elevation_geometry)
+    
+    def _build_elevation_geometry(self) -> Dict[str, Any]:
+        def aabbs(boundaries) -> np.ndarray:
+            return np.array(
+                [(b.x, b.y, b.x + b.width, b.y + b.height) for b in boundaries], dtype=float
+            ).reshape(-1, 4)
+        
+        # Same precedence as get_elevation_at_position: elevated areas first,
+        # ramps before stairs
+        areas = sorted(self.areas.values(), key=lambda a: a.elevation, reverse=True)
+        blockers = list(self.walls.values()) + list(self.objects.values())
+        surfaces = list(self.ramps.values()) + list(self.stairs.values())
+        return {
+            "area_aabb": aabbs(areas),
+            "area_elevation": np.array([a.elevation for a in areas], dtype=float),
+            "blocker_aabb": aabbs(blockers),
+            "blocker_z": np.array([b.z for b in blockers], dtype=float),
+            "surface_aabb": aabbs(surfaces),
+            "surfaces": surfaces,
+        }
+    
+    def get_elevations_at_positions(self, xs, ys) -> np.ndarray:
+        """
+        Vectorized get_elevation_at_position for many points at once.
+        
+        Args:
+            xs: X-coordinates of the positions
+            ys: Y-coordinates of the positions
+            
+        Returns:
+            np.ndarray: The elevation at each position
+        """
+        geometry = self._get_elevation_geometry()
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        px = xs[:, None]
+        py = ys[:, None]
+        
+        def inside(aabb: np.ndarray) -> np.ndarray:
+            return (aabb[:, 0] <= px) & (px < aabb[:, 2]) & (aabb[:, 1] <= py) & (py < aabb[:, 3])
+        
+        # Elevation of the first (highest) area containing each point
+        elevation = np.zeros(len(xs))
+        if len(geometry["area_elevation"]):
+            in_area = inside(geometry["area_aabb"])
+            first_area = in_area.argmax(axis=1)
+            elevation = np.where(in_area.any(axis=1), geometry["area_elevation"][first_area], 0.0)
+        
+        # Raise to the highest wall/object base underneath
+        in_blocker = inside(geometry["blocker_aabb"])
+        blocker_z = np.where(in_blocker, geometry["blocker_z"], -np.inf).max(axis=1, initial=-np.inf)
+        elevation = np.maximum(elevation, blocker_z)
+        
+        # Ramps and stairs override everything else
+        in_surface = inside(geometry["surface_aabb"])
+        for i in np.flatnonzero(in_surface.any(axis=1)):
+            surface = geometry["surfaces"][in_surface[i].argmax()]
+            elevation[i] = surface.get_elevation_at_point(xs[i], ys[i])
         return elevation
     
     def is_within_bomb_site(self, x: float, y: float, z: float = 0.0) -> Optional[str]:
@@ -689,16 +1069,16 @@ class Map:
         if x - radius < 0 or x + radius > self.width or y - radius < 0 or y + radius > self.height:
             return False
         
+        # Only boundaries in grid cells touched by the point or the player's footprint can matter
+        grids = self._get_spatial_grids()
+        
         # Prevent walking under elevated areas: if xy is in an area's footprint but below its base height
         for area in self.areas.values():
             if (area.x <= x <= area.x + area.width and
                 area.y <= y <= area.y + area.height and
                 z < area.elevation):
                 # allow if on a ramp or stair surface at this position
-                on_surface = any(ramp.contains_point(x, y, z) for ramp in self.ramps.values())
-                if on_surface:
-                    continue
-                on_surface = any(stair.contains_point(x, y, z) for stair in self.stairs.values())
+                on_surface = any(surface.contains_point(x, y, z) for surface in grids["surfaces"].query(x, y))
                 if on_surface:
                     continue
                 return False
@@ -708,12 +1088,12 @@ class Map:
             return False
         
         # Check collision with walls
-        for wall in self.walls.values():
+        for wall in grids["walls"].query_rect(x - radius, y - radius, x + radius, y + radius):
             if wall.collides_with_circle(x, y, radius, z, is_3d_check=True):
                 return False
         
         # Check collision with objects (enforce 3D clearance for underpasses)
-        for obj in self.objects.values():
+        for obj in grids["objects"].query_rect(x - radius, y - radius, x + radius, y + radius):
             # If the object has height, check if player's body (from z to z+height) overlaps with the object
             if obj.height_z > 0:
                 player_bottom = z
@@ -741,11 +1121,11 @@ class Map:
         # Must be in a valid area or on a ramp/stair surface
         if not start_area or not end_area:
             # allow if moving onto or off of a ramp or stair
-            on_surface = any(ramp.contains_point(start_x, start_y, start_z) or ramp.contains_point(end_x, end_y, end_z)
-                              for ramp in self.ramps.values())
-            if not on_surface:
-                on_surface = any(stair.contains_point(start_x, start_y, start_z) or stair.contains_point(end_x, end_y, end_z)
-                                  for stair in self.stairs.values())
+            surfaces = self._get_spatial_grids()["surfaces"]
+            on_surface = (any(surface.contains_point(start_x, start_y, start_z)
+                              for surface in surfaces.query(start_x, start_y)) or
+                          any(surface.contains_point(end_x, end_y, end_z)
+                              for surface in surfaces.query(end_x, end_y)))
             if not on_surface:
                 return False
         
@@ -754,18 +1134,11 @@ class Map:
         end_map_elev = self.get_elevation_at_position(end_x, end_y)
         if end_map_elev > start_map_elev:
             # Allow elevation change if on ramp or stair (entering or exiting), or if elevations match
-            on_surface = False
-            for ramp in self.ramps.values():
-                if ramp.contains_point(start_x, start_y, start_map_elev) or \
-                   ramp.contains_point(end_x, end_y, end_map_elev):
-                    on_surface = True
-                    break
-            if not on_surface:
-                for stair in self.stairs.values():
-                    if stair.contains_point(start_x, start_y, start_map_elev) or \
-                       stair.contains_point(end_x, end_y, end_map_elev):
-                        on_surface = True
-                        break
+            surfaces = self._get_spatial_grids()["surfaces"]
+            on_surface = (any(surface.contains_point(start_x, start_y, start_map_elev)
+                              for surface in surfaces.query(start_x, start_y)) or
+                          any(surface.contains_point(end_x, end_y, end_map_elev)
+                              for surface in surfaces.query(end_x, end_y)))
             # Also allow if elevations match exactly (e.g. ramp to area)
             if not on_surface and abs(end_map_elev - start_map_elev) > 1e-4:
                 return False
@@ -795,11 +1168,15 @@ class Map:
         nearest_t = max_range
         hit_obj = None
         hit_point = None
+        # Any hit lies on the segment out to max_range, so boxes clear of the segment's
+        # xy bounds (with a little slack for rounding) can be skipped before the slab test
+        ex, ey = ox + dx * max_range, oy + dy * max_range
+        seg_min_x, seg_max_x = min(ox, ex) - 1e-6, max(ox, ex) + 1e-6
+        seg_min_y, seg_max_y = min(oy, ey) - 1e-6, max(oy, ey) + 1e-6
         # Check AABB intersections for walls and objects
-        for boundary in list(self.walls.values()) + list(self.objects.values()):
-            # AABB bounds
-            mn_x, mn_y, mn_z = boundary.x, boundary.y, boundary.z
-            mx_x, mx_y, mx_z = boundary.x + boundary.width, boundary.y + boundary.height, boundary.z + boundary.height_z
+        for boundary, mn_x, mn_y, mn_z, mx_x, mx_y, mx_z in self._get_raycast_boxes():
+            if mx_x < seg_min_x or mn_x > seg_max_x or mx_y < seg_min_y or mn_y > seg_max_y:
+                continue
             tmin, tmax = 0.0, max_range
             # X slab
             if abs(dx) < 1e-10:
@@ -893,37 +1270,86 @@ class Map:
 
     def find_path(self, start: Tuple[float, float], goal: Tuple[float, float], radius: float = 0.5, height: float = 1.0) -> List[Tuple[float, float]]:
         """Find a path on the map grid from start to goal using BFS."""
-        import collections
         start_cell = (int(start[0]), int(start[1]))
         end_cell = (int(goal[0]), int(goal[1]))
-        frontier = collections.deque([start_cell])
-        came_from = {start_cell: None}
-        while frontier:
-            current = frontier.popleft()
-            if current == end_cell:
+        if start_cell == end_cell:
+            return [(start_cell[0] + 0.5, start_cell[1] + 0.5)]
+        width, grid_height = math.ceil(self.width), math.ceil(self.height)
+        if not (0 <= start_cell[0] < width and 0 <= start_cell[1] < grid_height):
+            return []
+        # Cells pack into ints (x * grid_height + y); each is enqueued at most
+        # once, so the queue is one preallocated array read from head to tail
+        cells = width * grid_height
+        came_from = array('i', [-1]) * cells
+        frontier = array('i', [0]) * cells
+        start_key = start_cell[0] * grid_height + start_cell[1]
+        end_key = end_cell[0] * grid_height + end_cell[1]
+        came_from[start_key] = start_key
+        frontier[0] = start_key
+        head, tail = 0, 1
+        while head < tail:
+            current = frontier[head]
+            head += 1
+            if current == end_key:
                 break
-            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                neighbor = (current[0] + dx, current[1] + dy)
-                x, y = neighbor
-                if 0 <= x < self.width and 0 <= y < self.height and neighbor not in came_from:
-                    # Check if this cell is passable
-                    if self.is_valid_position(x + 0.5, y + 0.5, 0.0, radius, height):
+            cx, cy = divmod(current, grid_height)
+            for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+                x, y = cx + dx, cy + dy
+                if 0 <= x < width and 0 <= y < grid_height:
+                    neighbor = x * grid_height + y
+                    # Check if this cell is unvisited and passable
+                    if came_from[neighbor] == -1 and self.is_valid_position(x + 0.5, y + 0.5, 0.0, radius, height):
                         came_from[neighbor] = current
-                        frontier.append(neighbor)
+                        frontier[tail] = neighbor
+                        tail += 1
         # Reconstruct path if found
-        if end_cell not in came_from:
+        if not (0 <= end_cell[0] < width and 0 <= end_cell[1] < grid_height) or came_from[end_key] == -1:
             return []
         path = []
-        curr = end_cell
-        while curr is not None:
-            path.append((curr[0] + 0.5, curr[1] + 0.5))
-            curr = came_from[curr]
+        key = end_key
+        while True:
+            x, y = divmod(key, grid_height)
+            path.append((x + 0.5, y + 0.5))
+            if key == start_key:
+                break
+            key = came_from[key]
         path.reverse()
         return path
 
+    def _nearest_valid_cell(self, x: int, y: int, radius: float, height: float,
+                            reach: int = 2) -> Optional[Tuple[int, int, float]]:
+        """
+        Find the valid grid cell nearest to (x, y), standing on the terrain.
+        
+        Cells within reach are masked by walkability and the one at the smallest
+        Chebyshev distance wins.
+        
+        Returns:
+            (x, y, elevation) of the chosen cell, or None if none is valid
+        """
+        offsets = np.arange(-reach, reach + 1)
+        xs, ys = np.meshgrid(x + offsets, y + offsets, indexing="ij")
+        xs, ys = xs.ravel(), ys.ravel()
+        # Cells off the grid are never valid positions
+        on_grid = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        xs, ys = xs[on_grid], ys[on_grid]
+        walkable = np.frombuffer(self.get_walkable_mask(radius, height), dtype=np.uint8)
+        valid = walkable[ys * int(self.width) + xs].astype(bool)
+        if not valid.any():
+            return None
+        xs, ys = xs[valid], ys[valid]
+        # argmin keeps the first of equally near cells
+        nearest = int(np.argmin(np.maximum(np.abs(xs - x), np.abs(ys - y))))
+        tx, ty = int(xs[nearest]), int(ys[nearest])
+        return (tx, ty, float(self.get_elevation_grid()[tx, ty]))
+    
     def find_path_3d(self, start: Tuple[float, float, float], goal: Tuple[float, float, float], max_jump_height: float = 1.5, radius: float = 0.5, height: float = 1.0) -> List[Tuple[float, float, float]]:
-        """Find a path considering jumping and elevation changes in 3D using BFS."""
-        import collections
+        """
+        Find a path considering jumping and elevation changes in 3D using A*.
+        
+        Steps cost 1 (cardinal) or sqrt(2) (diagonal) plus the elevation change,
+        guided by an octile-distance heuristic to the goal.
+        """
         # Extract start and goal coordinates
         start_x, start_y, start_z = start
         goal_x, goal_y, goal_z = goal
@@ -938,80 +1364,40 @@ class Map:
             return []
         # Validate or adjust goal position
         if not self.is_valid_position(goal_cell[0], goal_cell[1], goal_cell[2], radius, height):
-            found_alt = False
-            for dx in range(-2, 3):
-                for dy in range(-2, 3):
-                    tx = goal_cell[0] + dx
-                    ty = goal_cell[1] + dy
-                    tz = self.get_elevation_at_position(tx, ty)
-                    if self.is_valid_position(tx, ty, tz, radius, height):
-                        goal_cell = (tx, ty, tz)
-                        goal_z = tz
-                        found_alt = True
-                        break
-                if found_alt:
-                    break
-            if not found_alt:
+            goal_cell = self._nearest_valid_cell(goal_cell[0], goal_cell[1], radius, height)
+            if goal_cell is None:
                 return []
-        # BFS setup
-        frontier = collections.deque([start_cell])
-        came_from = {start_cell: None}
-        iterations = 0
-        max_iterations = 5000
-        # Perform BFS
-        while frontier and iterations < max_iterations:
-            iterations += 1
-            cx, cy, cz = frontier.popleft()
-            # Goal reached?
-            if (cx, cy) == (goal_cell[0], goal_cell[1]) and abs(cz - goal_z) < 0.1:
-                break
-            # Current elevation
-            current_elev = self.get_elevation_at_position(cx, cy)
-            # Explore neighbors
-            for dx, dy in [(-1,0),(1,0),(0,-1),(0,1),(-1,-1),(1,1),(-1,1),(1,-1)]:
-                nx, ny = cx + dx, cy + dy
-                # Bounds check
-                if nx < 0 or ny < 0 or nx >= self.width or ny >= self.height:
-                    continue
-                nelev = self.get_elevation_at_position(nx, ny)
-                # Check if standing on stairs or ramp at current
-                on_stairs = any(st.x <= cx <= st.x + st.width and st.y <= cy <= st.y + st.height for st in self.stairs.values())
-                on_ramp   = any(rp.x <= cx <= rp.x + rp.width and rp.y <= cy <= rp.y + rp.height for rp in self.ramps.values())
-                # Determine neighbor z
-                if abs(nelev - cz) < 0.1:
-                    nz = nelev
-                elif nelev < cz:
-                    nz = nelev  # always allow going down
-                else:
-                    # going up
-                    climb = max_jump_height
-                    if on_stairs or on_ramp:
-                        climb = 3.0
-                    if nelev - cz > climb:
-                        continue
-                    nz = nelev
-                neighbor = (nx, ny, nz)
-                # Validate and enqueue
-                if neighbor not in came_from and self.is_valid_position(nx, ny, nz, radius, height):
-                    came_from[neighbor] = (cx, cy, cz)
-                    frontier.append(neighbor)
-        # Check for failure
-        finish_key = (goal_cell[0], goal_cell[1], goal_cell[2])
-        if iterations >= max_iterations or finish_key not in came_from:
-            return []
-        # Reconstruct the path
-        path = []
-        node = finish_key
-        while node is not None:
-            path.append((node[0] + 0.5, node[1] + 0.5, node[2]))
-            node = came_from[node]
-        path.reverse()
-        return path
+        # The map is static between geometry changes, so solved paths are reused;
+        # the cache is dropped together with the other derived geometry
+        path_cache = self._cached_geometry("path_cache", OrderedDict)
+        cache_key = (start_cell, goal_cell, max_jump_height, radius, height)
+        if cache_key in path_cache:
+            path_cache.move_to_end(cache_key)
+            return list(path_cache[cache_key])
+        elevation_array = self.get_elevation_grid()
+        masks = self.get_surface_masks()
+        path = _astar_grid(
+            self.get_neighbor_table(radius, height),
+            elevation_array.shape[0],
+            elevation_array.shape[1],
+            masks["stairs"],
+            masks["ramps"],
+            start_cell,
+            goal_cell,
+            float(elevation_array[start_cell[0], start_cell[1]]),
+            float(elevation_array[goal_cell[0], goal_cell[1]]),
+            max_jump_height,
+        )
+        path_cache[cache_key] = path
+        if len(path_cache) > _PATH_CACHE_SIZE:
+            path_cache.popitem(last=False)
+        return list(path)
 
     # Add these methods to the Map class
     def add_area(self, area: MapArea) -> None:
         """Add an area to the map."""
         self.areas[area.name] = area
+        self.invalidate_geometry_cache()
     
     def add_boundary(self, boundary) -> None:
         """
@@ -1033,6 +1419,8 @@ class Map:
             self.ramps[boundary.name] = boundary
         elif boundary.boundary_type == "stairs" or isinstance(boundary, StairsBoundary):
             self.stairs[boundary.name] = boundary
+        # Replacing a boundary under an existing name keeps every count the same
+        self.invalidate_geometry_cache()
 
     def set_elevation_at_position(self, x: float, y: float, elevation: float) -> None:
         """
@@ -1084,9 +1472,22 @@ class Map:
         # Use direction if present, else default to 0 (facing right)
         direction_deg = getattr(source, 'direction', 0)
         direction_rad = math.radians(direction_deg)
-        facing_dir = (math.cos(direction_rad), math.sin(direction_rad), 0)
+        facing_x, facing_y = math.cos(direction_rad), math.sin(direction_rad)
         half_fov_rad = math.radians(fov_angle / 2)
+        cos_half_fov = math.cos(half_fov_rad)
+        # The cone test dot/distance >= cos_half_fov is done on squares so targets
+        # outside the cone or range are rejected before any sqrt or raycast
+        cos_half_fov_sq = cos_half_fov * cos_half_fov
+        wide_fov = cos_half_fov < 0
+        max_distance_sq = max_distance * max_distance
         px, py, pz = source.location
+        # Smoke clouds that can block sight lines; the same for every target
+        smokes = []
+        for effect in getattr(source, 'utility_active', []) + getattr(self, '_active_effects', []):
+            if effect.get("type") == "smoke":
+                smoke_center = effect.get("position")
+                if smoke_center:
+                    smokes.append((smoke_center[0], smoke_center[1], effect.get("radius", 3.0)))
         
         for other in all_players:
             # Skip self or dead players
@@ -1097,48 +1498,42 @@ class Map:
             
             ox, oy, oz = other.location
             to_other = (ox - px, oy - py, oz - pz)
-            distance = math.sqrt(to_other[0]**2 + to_other[1]**2 + to_other[2]**2)
-            if distance > max_distance:
+            distance_sq = to_other[0]**2 + to_other[1]**2 + to_other[2]**2
+            if distance_sq > max_distance_sq or distance_sq == 0:
                 continue
-            if distance > 0:
-                to_other_normalized = (to_other[0]/distance, to_other[1]/distance, to_other[2]/distance)
+            dot = facing_x * to_other[0] + facing_y * to_other[1]
+            if wide_fov:
+                in_cone = dot >= 0 or dot * dot <= cos_half_fov_sq * distance_sq
             else:
-                continue
-            dot_product = (facing_dir[0] * to_other_normalized[0] + 
-                           facing_dir[1] * to_other_normalized[1] + 
-                           facing_dir[2] * to_other_normalized[2])
-            cos_half_fov = math.cos(half_fov_rad)
-            if dot_product >= cos_half_fov:
+                in_cone = dot >= 0 and dot * dot >= cos_half_fov_sq * distance_sq
+            if in_cone:
+                distance = math.sqrt(distance_sq)
+                to_other_normalized = (to_other[0]/distance, to_other[1]/distance, to_other[2]/distance)
                 hit_distance, hit_point, hit_object = self.raycast(
                     source.location, 
                     to_other_normalized, 
                     distance
                 )
-                vision_blocked_by_smoke = False
-                utility_active = getattr(source, 'utility_active', [])
-                _active_effects = getattr(self, '_active_effects', [])
-                for effect in utility_active + _active_effects:
-                    if effect.get("type") == "smoke":
-                        smoke_center = effect.get("position")
-                        smoke_radius = effect.get("radius", 3.0)
-                        if smoke_center:
-                            sx, sy = smoke_center[0], smoke_center[1]
-                            ax, ay = source.location[0], source.location[1]
-                            bx, by = other.location[0], other.location[1]
-                            dx_line = bx - ax
-                            dy_line = by - ay
-                            if dx_line == 0 and dy_line == 0:
-                                dist = math.hypot(sx - ax, sy - ay)
-                            else:
-                                t = ((sx - ax) * dx_line + (sy - ay) * dy_line) / (dx_line*dx_line + dy_line*dy_line)
-                                t = max(0.0, min(1.0, t))
-                                proj_x = ax + t * dx_line
-                                proj_y = ay + t * dy_line
-                                dist = math.hypot(sx - proj_x, sy - proj_y)
-                            if dist <= smoke_radius:
-                                vision_blocked_by_smoke = True
-                                break
-                if (hit_distance is None or hit_distance >= distance) and not vision_blocked_by_smoke:
+                # Smokes only matter for sight lines no wall already blocks; the
+                # line's 2D segment is the same for every smoke
+                visible = hit_distance is None or hit_distance >= distance
+                if visible and smokes:
+                    dx_line, dy_line = to_other[0], to_other[1]
+                    point_line = dx_line == 0 and dy_line == 0
+                    line_len_sq = dx_line*dx_line + dy_line*dy_line
+                    for sx, sy, smoke_radius in smokes:
+                        if point_line:
+                            dist = math.hypot(sx - px, sy - py)
+                        else:
+                            t = ((sx - px) * dx_line + (sy - py) * dy_line) / line_len_sq
+                            t = max(0.0, min(1.0, t))
+                            proj_x = px + t * dx_line
+                            proj_y = py + t * dy_line
+                            dist = math.hypot(sx - proj_x, sy - proj_y)
+                        if dist <= smoke_radius:
+                            visible = False
+                            break
+                if visible:
                     visible_players.append(other)
                     # Check if other player is looking back (for flash effects)
                     other_direction_rad = math.radians(getattr(other, 'direction', 0))
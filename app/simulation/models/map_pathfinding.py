@@ -3,6 +3,9 @@ from typing import List, Tuple, Optional, Dict
 import heapq
 import math
 
+# Per-iteration A* tracing; very noisy, so it is off by default
+DEBUG = False
+
 class Node:
     """A node in the pathfinding graph."""
     def __init__(self, position: Tuple[float, float, float], g_cost: float = 0, 
@@ -83,22 +86,20 @@ class NavigationMesh:
         grid_w = min(grid_w, self.grid_width - grid_x)
         grid_h = min(grid_h, self.grid_height - grid_y)
         
-        # Create elevation gradient
-        for dy in range(grid_h):
-            for dx in range(grid_w):
-                if direction == "north":
-                    progress = float(dy) / (grid_h - 1) if grid_h > 1 else 1.0
-                elif direction == "south":
-                    progress = 1.0 - (float(dy) / (grid_h - 1)) if grid_h > 1 else 0.0
-                elif direction == "east":
-                    progress = float(dx) / (grid_w - 1) if grid_w > 1 else 1.0
-                else:  # west
-                    progress = 1.0 - (float(dx) / (grid_w - 1)) if grid_w > 1 else 0.0
-                
-                elevation = start_z + (end_z - start_z) * progress
-                if 0 <= grid_y + dy < self.grid_height and 0 <= grid_x + dx < self.grid_width:
-                    self.elevation[grid_y + dy, grid_x + dx] = elevation
-                    self.walkable[grid_y + dy, grid_x + dx] = True
+        # Create elevation gradient: progress runs 0..1 across the cells along the
+        # climb axis and is the same for every cell across it
+        along_y = direction in ("north", "south")
+        cells = grid_h if along_y else grid_w
+        progress = np.arange(cells, dtype=float) / (cells - 1) if cells > 1 else np.ones(1)
+        if direction not in ("north", "east"):
+            # South, and west for any other direction
+            progress = 1.0 - progress
+        gradient = start_z + (end_z - start_z) * progress
+        
+        rows = slice(grid_y, grid_y + grid_h)
+        cols = slice(grid_x, grid_x + grid_w)
+        self.elevation[rows, cols] = gradient[:, np.newaxis] if along_y else gradient[np.newaxis, :]
+        self.walkable[rows, cols] = True
 
     def add_area(self, name: str, area_data: Dict):
         """Add an area to the navigation mesh."""
@@ -186,9 +187,10 @@ class PathFinder:
     def find_path(self, start: Tuple[float, float, float], 
                   goal: Tuple[float, float, float]) -> List[Tuple[float, float, float]]:
         """Find a path from start to goal."""
-        print(f"\nPathfinding debug:")
-        print(f"Start: {start}")
-        print(f"Goal: {goal}")
+        if DEBUG:
+            print(f"\nPathfinding debug:")
+            print(f"Start: {start}")
+            print(f"Goal: {goal}")
         
         # Convert to grid coordinates
         start_x = int(start[0] / self.nav_mesh.cell_size)
@@ -198,57 +200,68 @@ class PathFinder:
         
         # Check if start or goal is out of bounds or not walkable
         if not (0 <= start_x < self.nav_mesh.grid_width and 0 <= start_y < self.nav_mesh.grid_height):
-            print("Start position out of bounds")
+            if DEBUG:
+                print("Start position out of bounds")
             return []
         if not (0 <= goal_x < self.nav_mesh.grid_width and 0 <= goal_y < self.nav_mesh.grid_height):
-            print("Goal position out of bounds")
+            if DEBUG:
+                print("Goal position out of bounds")
             return []
         if not self.nav_mesh.walkable[start_y, start_x]:
-            print("Start position not walkable")
+            if DEBUG:
+                print("Start position not walkable")
             return []
         if not self.nav_mesh.walkable[goal_y, goal_x]:
-            print("Goal position not walkable")
+            if DEBUG:
+                print("Goal position not walkable")
             return []
         
         # Create start and goal nodes
         start_node = Node(start, g_cost=0, h_cost=self._distance_to(start, goal))
         goal_pos = goal
         
-        # Initialize open and closed sets
+        # Initialize open and closed sets. Heap entries are (f_cost, push order, node),
+        # so ties pop first-in first-out without calling Node.__lt__.
         open_set = []
         closed_set = set()
-        open_dict = {}  # For faster lookup
+        open_dict = {}  # Live node per open position; other heap entries for it are stale
+        push_count = 0
         
         # Add start node to open set
-        heapq.heappush(open_set, start_node)
+        heapq.heappush(open_set, (start_node.f_cost, push_count, start_node))
         open_dict[start_node.position] = start_node
         
         iterations = 0
         max_iterations = 1000
         
         while open_set and iterations < max_iterations:
+            # Get node with lowest f_cost, skipping entries superseded by a cheaper path
+            current = heapq.heappop(open_set)[2]
+            if open_dict.get(current.position) is not current:
+                continue
+            del open_dict[current.position]
             iterations += 1
             
-            # Get node with lowest f_cost
-            current = heapq.heappop(open_set)
-            open_dict.pop(current.position)
-            
             # Check if reached goal - more lenient distance check
             dist_to_goal = self._distance_to(current.position, goal)
             if dist_to_goal < self.nav_mesh.cell_size * 1.5:
-                print(f"Found path after {iterations} iterations")
+                if DEBUG:
+                    print(f"Found path after {iterations} iterations")
                 path = self._reconstruct_path(current)
                 if path:
                     if dist_to_goal > 0.1:
                         path.append(goal)
-                    print(f"Path found: {path}")
+                    if DEBUG:
+                        print(f"Path found: {path}")
                     return path
-                print("Failed to reconstruct path")
+                if DEBUG:
+                    print("Failed to reconstruct path")
                 return []
             
             # Get and check neighbors
             neighbors = self._get_neighbors(current, goal)
-            print(f"Iteration {iterations}: Current={current.position}, Found {len(neighbors)} neighbors")
+            if DEBUG:
+                print(f"Iteration {iterations}: Current={current.position}, Found {len(neighbors)} neighbors")
             
             # Add current to closed set AFTER getting neighbors
             # This allows revisiting nodes if we find a better path
@@ -265,24 +278,20 @@ class PathFinder:
                 # Create neighbor node
                 neighbor = Node(neighbor_pos, g_cost, h_cost, current)
                 
-                # Check if already in open set with better path
-                if neighbor_pos in open_dict:
-                    existing = open_dict[neighbor_pos]
-                    if neighbor.g_cost < existing.g_cost:
-                        # Update existing node
-                        existing.g_cost = neighbor.g_cost
-                        existing.f_cost = existing.g_cost + existing.h_cost
-                        existing.parent = current
-                        # Reheapify
-                        heapq.heapify(open_set)
-                else:
-                    heapq.heappush(open_set, neighbor)
+                # Check if already in open set with better path; the cheaper node
+                # replaces it and the old heap entry is skipped when popped
+                existing = open_dict.get(neighbor_pos)
+                if existing is None or neighbor.g_cost < existing.g_cost:
+                    push_count += 1
+                    heapq.heappush(open_set, (neighbor.f_cost, push_count, neighbor))
                     open_dict[neighbor_pos] = neighbor
         
         if iterations >= max_iterations:
-            print("Reached maximum iterations")
+            if DEBUG:
+                print("Reached maximum iterations")
         else:
-            print("No more nodes to explore")
+            if DEBUG:
+                print("No more nodes to explore")
         return []
     
     def _reconstruct_path(self, end_node: Node) -> List[Tuple[float, float, float]]:
@@ -308,8 +317,9 @@ class PathFinder:
         # Check if current position is on stairs
         curr_elev = self.nav_mesh.elevation[curr_grid_y, curr_grid_x]
         on_stairs = curr_elev > 0.01
-        print(f"\nChecking neighbors for position ({x:.1f}, {y:.1f}, {z:.1f})")
-        print(f"Current elevation: {curr_elev:.2f}, on_stairs: {on_stairs}")
+        if DEBUG:
+            print(f"\nChecking neighbors for position ({x:.1f}, {y:.1f}, {z:.1f})")
+            print(f"Current elevation: {curr_elev:.2f}, on_stairs: {on_stairs}")
         
         # Determine step sizes based on context
         if on_stairs:
@@ -345,7 +355,8 @@ class PathFinder:
                 
                 # Skip if not walkable
                 if not self.nav_mesh.is_walkable(new_x, new_y):
-                    print(f"Position ({new_x:.1f}, {new_y:.1f}) not walkable")
+                    if DEBUG:
+                        print(f"Position ({new_x:.1f}, {new_y:.1f}) not walkable")
                     continue
                 
                 # Use grid elevation for z-coordinate when on stairs
@@ -370,19 +381,22 @@ class PathFinder:
                     max_step = 0.3
                 
                 if elev_diff > max_step:
-                    print(f"Elevation difference too large: {elev_diff:.2f} > {max_step:.2f} at ({new_x:.1f}, {new_y:.1f}, {new_z:.1f})")
+                    if DEBUG:
+                        print(f"Elevation difference too large: {elev_diff:.2f} > {max_step:.2f} at ({new_x:.1f}, {new_y:.1f}, {new_z:.1f})")
                     continue
                 
                 # Check for collisions
                 if self.nav_mesh.collision_detector and self.nav_mesh.collision_detector.check_collision(
                     node.position, (new_x, new_y, new_z)
                 ):
-                    print(f"Collision detected at ({new_x:.1f}, {new_y:.1f}, {new_z:.1f})")
+                    if DEBUG:
+                        print(f"Collision detected at ({new_x:.1f}, {new_y:.1f}, {new_z:.1f})")
                     continue
                 
                 # Add valid neighbor
                 neighbors.append((new_x, new_y, new_z))
-                print(f"Added neighbor: ({new_x:.1f}, {new_y:.1f}, {new_z:.1f})")
+                if DEBUG:
+                    print(f"Added neighbor: ({new_x:.1f}, {new_y:.1f}, {new_z:.1f})")
         
         return neighbors
 
@@ -393,7 +407,11 @@ class CollisionDetector:
     
     def check_collision(self, start: Tuple[float, float, float], 
                        end: Tuple[float, float, float]) -> bool:
-        """Check if there is a collision between start and end points."""
+        """Check if there is a collision between start and end points.
+        
+        Walks every grid cell the segment crosses (Amanatides-Woo traversal),
+        so a segment cannot slip diagonally between two blocked cells.
+        """
         x1, y1, z1 = start
         x2, y2, z2 = end
         
@@ -401,47 +419,77 @@ class CollisionDetector:
         dx = x2 - x1
         dy = y2 - y1
         dz = z2 - z1
-        distance = math.sqrt(dx*dx + dy*dy + dz*dz)
         
-        if distance == 0:
+        if dx == 0 and dy == 0 and dz == 0:
             return False
-            
-        # Normalize direction
-        dx /= distance
-        dy /= distance
-        dz /= distance
-        
-        # Check points along the path
-        steps = int(distance / (self.nav_mesh.cell_size * 0.5))
-        steps = max(steps, 1)  # At least 1 step
-        
-        for i in range(steps + 1):
-            t = i * distance / steps
-            x = x1 + dx * t
-            y = y1 + dy * t
-            z = z1 + dz * t
-            
-            # Convert to grid coordinates
-            grid_x = int(x / self.nav_mesh.cell_size)
-            grid_y = int(y / self.nav_mesh.cell_size)
-            
+        
+        nav_mesh = self.nav_mesh
+        cell_size = nav_mesh.cell_size
+        walkable = nav_mesh.walkable
+        elevation = nav_mesh.elevation
+        grid_width = nav_mesh.grid_width
+        grid_height = nav_mesh.grid_height
+        
+        # Cells holding the two endpoints
+        grid_x = math.floor(x1 / cell_size)
+        grid_y = math.floor(y1 / cell_size)
+        end_x = math.floor(x2 / cell_size)
+        end_y = math.floor(y2 / cell_size)
+        
+        # Segment parameter t runs 0..1; t_max is where the next cell boundary is
+        # crossed on each axis and t_delta is the span of one cell along it
+        if dx > 0:
+            step_x = 1
+            t_max_x = ((grid_x + 1) * cell_size - x1) / dx
+            t_delta_x = cell_size / dx
+        elif dx < 0:
+            step_x = -1
+            t_max_x = (grid_x * cell_size - x1) / dx
+            t_delta_x = -cell_size / dx
+        else:
+            step_x = 0
+            t_max_x = t_delta_x = math.inf
+        if dy > 0:
+            step_y = 1
+            t_max_y = ((grid_y + 1) * cell_size - y1) / dy
+            t_delta_y = cell_size / dy
+        elif dy < 0:
+            step_y = -1
+            t_max_y = (grid_y * cell_size - y1) / dy
+            t_delta_y = -cell_size / dy
+        else:
+            step_y = 0
+            t_max_y = t_delta_y = math.inf
+        
+        t = 0.0
+        while True:
             # Check bounds
-            if not (0 <= grid_x < self.nav_mesh.grid_width and 0 <= grid_y < self.nav_mesh.grid_height):
+            if not (0 <= grid_x < grid_width and 0 <= grid_y < grid_height):
                 return True
                 
             # Check if walkable
-            if not self.nav_mesh.walkable[grid_y, grid_x]:
+            if not walkable[grid_y, grid_x]:
                 return True
-                
-            # Get ground elevation at this point
-            ground_z = self.nav_mesh.get_elevation(x, y)
             
-            # Allow movement along stairs/ramps
-            if abs(z - ground_z) <= 2.0:  # More lenient for stairs/ramps
-                continue
-                
-            # Prevent moving too far above or below ground
-            if z < ground_z - 0.1 or z > ground_z + 3.0:
-                return True
-                
-        return False
\ No newline at end of file
+            # Ground is flat within a cell and z is linear along the segment, so
+            # the height only needs checking where the segment enters and leaves
+            # the cell. Within 2 units of the ground is fine (stairs/ramps);
+            # otherwise it must not be below the ground or far above it.
+            t_exit = min(t_max_x, t_max_y)
+            ground_z = elevation[grid_y, grid_x]
+            for z in (z1 + dz * t, z1 + dz * min(t_exit, 1.0)):
+                if z < ground_z - 2.0 or z > ground_z + 3.0:
+                    return True
+            
+            if (grid_x == end_x and grid_y == end_y) or t_exit > 1.0:
+                return False
+            
+            # Step into the next cell along whichever boundary comes first
+            if t_max_x < t_max_y:
+                grid_x += step_x
+                t = t_max_x
+                t_max_x += t_delta_x
+            else:
+                grid_y += step_y
+                t = t_max_y
+                t_max_y += t_delta_y
\ No newline at end of file
@@ -3,6 +3,8 @@ from dataclasses import dataclass, field
 import math
 import random
 
+import numpy as np
+
 from app.simulation.models.map import Map
 from app.simulation.models.weapon import Weapon, WeaponFactory
 
@@ -35,7 +37,8 @@ class Player:
     is_looking_at_player: bool = False  # Whether player is currently looking at another player (for flash effects)
     
     # Movement physics
-    velocity: Tuple[float, float, float] = (0.0, 0.0, 0.0)  # (vx, vy, vz) in units per second
+    # (vx, vy, vz) in units per second, updated in place to avoid reallocating each tick
+    velocity: np.ndarray = field(default_factory=lambda: np.zeros(3), compare=False)
     acceleration: Tuple[float, float, float] = (0.0, 0.0, 0.0)  # (ax, ay, az) in units per second²
     max_speed: float = 5.5  # Maximum movement speed when running
     walk_speed: float = 3.5  # Slower movement when walking (Shift)
@@ -115,7 +118,7 @@ class Player:
     
     def reset_movement(self):
         """Reset player movement state."""
-        self.velocity = (0.0, 0.0, 0.0)
+        self.velocity[:] = 0.0
         self.acceleration = (0.0, 0.0, 0.0)
         self.is_moving = False
         self.is_walking = False
@@ -128,7 +131,7 @@ class Player:
     def get_current_max_speed(self) -> float:
         """Get the current maximum speed based on player state."""
         # Check for status effects that modify speed
-        if "slowed" in list(self.status_effects.keys()):
+        if "slowed" in self.status_effects:
             return self.max_speed * 0.6  # 60% of normal speed when slowed
         
         # In air movement is slightly slower
@@ -180,7 +183,7 @@ class Player:
         """Start a jump by applying an initial upward velocity."""
         self.is_jumping = True
         self.ground_contact = False
-        self.velocity = (self.velocity[0], self.velocity[1], self.jump_speed)
+        self.velocity[2] = self.jump_speed
         self.last_ground_z = self.location[2]
         
     def update_movement(self, time_step: float, game_map: Map):
@@ -193,7 +196,7 @@ class Player:
         """       
         # Prevent movement if planting or defusing
         if self.is_planting or self.is_defusing:
-            self.velocity = (0.0, 0.0, 0.0)
+            self.velocity[:] = 0.0
             self.acceleration = (0.0, 0.0, 0.0)
             return
         
@@ -203,6 +206,9 @@ class Player:
         # Get current max speed based on player state
         current_max_speed = self.get_current_max_speed()
         
+        # Integrate on local floats and write the results back once
+        vx, vy, vz = self.velocity.tolist()
+        
         # Apply horizontal acceleration based on movement input
         if self.movement_direction and self.is_moving:
             # Calculate target velocity based on movement direction and max speed
@@ -210,55 +216,46 @@ class Player:
             target_vy = self.movement_direction[1] * current_max_speed
             
             # Apply acceleration towards target velocity
-            self.acceleration = (
-                (target_vx - self.velocity[0]) * self.acceleration_rate,
-                (target_vy - self.velocity[1]) * self.acceleration_rate,
-                self.acceleration[2]
-            )
+            ax = (target_vx - vx) * self.acceleration_rate
+            ay = (target_vy - vy) * self.acceleration_rate
         else:
             # Apply friction to slow down horizontal movement when not moving
             # Create a friction force opposite to velocity direction
-            speed = math.sqrt(self.velocity[0]**2 + self.velocity[1]**2)
+            speed = math.sqrt(vx * vx + vy * vy)
             if speed > 0:
-                self.acceleration = (
-                    -self.velocity[0] / speed * self.friction,
-                    -self.velocity[1] / speed * self.friction,
-                    self.acceleration[2]
-                )
+                ax = -vx / speed * self.friction
+                ay = -vy / speed * self.friction
             else:
-                self.acceleration = (0.0, 0.0, self.acceleration[2])
+                ax = ay = 0.0
         
         # Apply gravity if not on ground
         if not self.ground_contact:
-            self.acceleration = (
-                self.acceleration[0],
-                self.acceleration[1],
-                -self.gravity
-            )
+            az = -self.gravity
         else:
             # Zero out vertical velocity and acceleration when on ground
-            self.velocity = (self.velocity[0], self.velocity[1], 0.0)
-            self.acceleration = (self.acceleration[0], self.acceleration[1], 0.0)
+            vz = 0.0
+            az = 0.0
+        self.acceleration = (ax, ay, az)
         
         # Update velocity based on acceleration
-        new_vx = self.velocity[0] + self.acceleration[0] * time_step
-        new_vy = self.velocity[1] + self.acceleration[1] * time_step
-        new_vz = self.velocity[2] + self.acceleration[2] * time_step
+        new_vx = vx + ax * time_step
+        new_vy = vy + ay * time_step
+        new_vz = vz + az * time_step
         
         # Clamp horizontal velocity to max speed
-        horiz_speed = math.sqrt(new_vx**2 + new_vy**2)
+        horiz_speed = math.sqrt(new_vx * new_vx + new_vy * new_vy)
         if horiz_speed > current_max_speed:
             scale_factor = current_max_speed / horiz_speed
             new_vx *= scale_factor
             new_vy *= scale_factor
         
         # Store the new velocity
-        self.velocity = (new_vx, new_vy, new_vz)
+        self.velocity[:] = (new_vx, new_vy, new_vz)
         
         # Calculate new position based on velocity
-        new_x = self.location[0] + self.velocity[0] * time_step
-        new_y = self.location[1] + self.velocity[1] * time_step
-        new_z = self.location[2] + self.velocity[2] * time_step
+        new_x = self.location[0] + new_vx * time_step
+        new_y = self.location[1] + new_vy * time_step
+        new_z = self.location[2] + new_vz * time_step
         
         # If not jumping or falling, attempt to snap to ground/ramps/stairs elevation
         if not self.is_jumping and not self.is_falling:
@@ -380,7 +377,7 @@ class Player:
                 self.deaths += 1
                 
         # Reset vertical velocity
-        self.velocity = (self.velocity[0], self.velocity[1], 0.0)
+        self.velocity[2] = 0.0
     
     def _resolve_collisions(self, game_map, new_position: Tuple[float, float, float]) -> Tuple[float, float, float]:
         """
@@ -409,7 +406,7 @@ class Player:
             else:
                 # Hit ceiling, stop upward movement
                 if self.velocity[2] > 0:
-                    self.velocity = (self.velocity[0], self.velocity[1], 0)
+                    self.velocity[2] = 0.0
                 return (new_x, new_y, self.location[2])
         
         # If not valid horizontally, try to slide along walls
@@ -450,12 +447,14 @@ class Player:
         """
         # Check for ceiling collisions
         # For each wall or object that could be above the player
-        for obj in list(game_map.walls.values()) + list(game_map.objects.values()):
-            # If this object is above the player position and player's head would hit it
-            if (obj.contains_point(x, y) and 
-                obj.elevation > 0 and 
-                z + self.height > obj.elevation):
-                return False
+        head_z = z + self.height
+        for boundaries in (game_map.walls, game_map.objects):
+            for obj in boundaries.values():
+                # If this object is above the player position and player's head would hit it
+                if (obj.elevation > 0 and 
+                    head_z > obj.elevation and 
+                    obj.contains_point(x, y)):
+                    return False
                 
         # No ceiling collisions found
         return True
@@ -465,12 +464,12 @@ class Player:
         # Check if we're moving in X direction
         if abs(self.velocity[0]) > 0.01 and self.location[0] != self.location[0] + self.velocity[0]:
             # We hit a wall in X direction, zero out X velocity
-            self.velocity = (0.0, self.velocity[1], self.velocity[2])
+            self.velocity[0] = 0.0
         
         # Check if we're moving in Y direction
         if abs(self.velocity[1]) > 0.01 and self.location[1] != self.location[1] + self.velocity[1]:
             # We hit a wall in Y direction, zero out Y velocity
-            self.velocity = (self.velocity[0], 0.0, self.velocity[2])
+            self.velocity[1] = 0.0
     
     def can_climb_to(self, game_map, position: Tuple[float, float, float]) -> bool:
         """
@@ -506,6 +505,15 @@ class Player:
         """Get the current z-coordinate of the player."""
         return self.location[2]
 
+    @property
+    def view_direction(self) -> Tuple[float, float, float]:
+        """Unit facing vector for direction (degrees); only recomputed after direction changes."""
+        cached = self.__dict__.get("_view_direction")
+        if cached is None or cached[0] != self.direction:
+            rad = math.radians(self.direction)
+            cached = self._view_direction = (self.direction, (math.cos(rad), math.sin(rad), 0.0))
+        return cached[1]
+    
     @property
     def in_air(self) -> bool:
         """Return True if the player is currently in the air (jumping or falling)."""
@@ -655,7 +663,7 @@ class Player:
         obs["plant_progress"] = self.plant_progress
         obs["defuse_progress"] = self.defuse_progress
         obs["status_effects"] = list(self.status_effects.keys())
-        obs["velocity"] = tuple(self.velocity)
+        obs["velocity"] = tuple(self.velocity.tolist())
         obs["is_walking"] = self.is_walking
         obs["is_crouching"] = self.is_crouching
         obs["is_jumping"] = self.is_jumping
@@ -5,6 +5,7 @@ from typing import Dict, List, Tuple, Optional, Any, TYPE_CHECKING, Set
 import random
 import math
 import time as time_module
+from collections import OrderedDict
 
 from app.simulation.models.player import Player
 from app.simulation.models.blackboard import Blackboard, EconomyInfo
@@ -31,6 +32,9 @@ FOOTSTEP_RANGE = 20.0
 GUNSHOT_RANGE = 50.0
 ABILITY_SOUND_RANGE = 35.0
 
+# Most recent line-of-sight results kept per round
+LINE_OF_SIGHT_CACHE_SIZE = 1024
+
 class RoundPhase(Enum):
     BUY = "buy"
     ROUND = "round"
@@ -246,6 +250,9 @@ class Round:
         self.dropped_weapons = []  # DroppedWeapon objects
         self.dropped_shields = []  # DroppedShield objects
         
+        # Line-of-sight results by (source, target) position; map geometry is static during a round
+        self._line_of_sight_cache: OrderedDict = OrderedDict()
+        
         # Round setup
         self._set_initial_strategies()
         self._assign_spike()
@@ -731,13 +738,25 @@ class Round:
             True if there is line of sight, False otherwise
         """
         if hasattr(self.map, "raycast"):
+            # Players holding an angle or waiting on the spike re-test the same
+            # pairs of positions tick after tick, so reuse those results
+            key = (tuple(source), tuple(target))
+            cache = self._line_of_sight_cache
+            visible = cache.get(key)
+            if visible is not None:
+                cache.move_to_end(key)
+                return visible
             # Use the Map's raycast function if available
             hit_distance, hit_point, hit_boundary = self.map.raycast(
                 (source[0], source[1], 0.0),  # source with z=0
                 (target[0] - source[0], target[1] - source[1], 0.0),  # direction vector
                 self._calculate_distance(source, target) + 0.1  # max distance slightly beyond target
             )
-            return hit_boundary is None or hit_distance is None
+            visible = hit_boundary is None or hit_distance is None
+            cache[key] = visible
+            if len(cache) > LINE_OF_SIGHT_CACHE_SIZE:
+                cache.popitem(last=False)
+            return visible
         else:
             # Fallback to simplified line of sight check
             for wall in self.map.walls.values():
@@ -943,9 +962,9 @@ class Round:
             advantage *= player.movement_accuracy / 100.0
         
         # Status effects
-        if "flashed" in list(player.status_effects.keys()):
+        if "flashed" in player.status_effects:
             advantage *= 0.2
-        if "slowed" in list(player.status_effects.keys()):
+        if "slowed" in player.status_effects:
             advantage *= 0.8
         
         # First shot advantage
@@ -1106,8 +1125,9 @@ class Round:
         weapon_to_remove = None
         for dropped in self.dropped_weapons:
             dx, dy = dropped.position[:2]
-            dist = math.sqrt((px - dx) ** 2 + (py - dy) ** 2)
-            if dist <= pickup_radius:
+            # Compare squared distances; the radius test needs no sqrt
+            ox, oy = px - dx, py - dy
+            if ox * ox + oy * oy <= pickup_radius * pickup_radius:
                 # If player already has a weapon, drop it at their current location
                 if player.weapon:
                     self._drop_weapon(player.id, player.weapon, (px, py))
@@ -1125,8 +1145,9 @@ class Round:
         shield_to_remove = None
         for dropped in self.dropped_shields:
             dx, dy = dropped.position[:2]
-            dist = math.sqrt((px - dx) ** 2 + (py - dy) ** 2)
-            if dist <= pickup_radius:
+            # Compare squared distances; the radius test needs no sqrt
+            ox, oy = px - dx, py - dy
+            if ox * ox + oy * oy <= pickup_radius * pickup_radius:
                 # If player already has a shield, drop it at their current location
                 if player.shield:
                     self._drop_shield(player.id, player.shield, (px, py))
@@ -1736,24 +1757,25 @@ class Round:
         """Update active abilities with proper mechanics."""
         current_time = self.tick
         
-        # Update and filter active abilities
+        # Update and filter active abilities; every ability this tick sees the same players
+        players = list(self.players.values())
         active_abilities = []
         for ability in self.active_abilities:
             if ability.get_remaining_duration(current_time) > 0:
                 # Update ability state
-                ability.update(time_step, current_time, self.map, list(self.players.values()))
+                ability.update(time_step, current_time, self.map, players)
                 active_abilities.append(ability)
                 
                 # Track affected players
                 if ability.effect_applied:
                     enemies_affected = 0
                     teammates_affected = 0
-                    ability_owner = self.players[ability.owner_id]
+                    owner_is_attacker = self.players[ability.owner_id].id in self.attacker_ids
                     
                     for pid in ability.affected_players:
                         if pid in self.players:
                             affected_player = self.players[pid]
-                            if (ability_owner.id in self.attacker_ids) == (affected_player.id in self.attacker_ids):
+                            if owner_is_attacker == (affected_player.id in self.attacker_ids):
                                 teammates_affected += 1
                             else:
                                 enemies_affected += 1
@@ -109,7 +109,7 @@ class Team:
             player.heard_sounds = []
             player.known_enemy_positions = {}
             player.status_effects = {}  # Reset status effects to empty dict
-            player.velocity = (0.0, 0.0)
+            player.velocity[:] = 0.0
             player.utility_active = []
         
         # Reset alive players set
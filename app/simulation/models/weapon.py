@@ -2,6 +2,7 @@
 Weapon system for Valorant simulation.
 """
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Dict, List, Optional
 from enum import Enum
 
@@ -29,301 +30,93 @@ class Weapon:
     equip_time: float  # Seconds
     wall_penetration: float  # 0-1, percentage of damage through walls
 
+# Range multiplier keys, in the order they appear in catalog rows.
+_RANGE_BANDS = ("close", "medium", "long")
+
+# Catalog rows in Weapon field order, with range multipliers given as a
+# (close, medium, long) tuple.
+_CATALOG_ROWS: List[tuple] = [
+    # SIDEARMS
+    ("Classic", WeaponType.SIDEARM, 0, 26, 6.75, (1.0, 0.8, 0.6), 0.5, 0.8, 0.6, 12, 1.75, 0.75, 0.2),
+    ("Shorty", WeaponType.SIDEARM, 150, 12, 3.3, (1.5, 0.5, 0.1), 0.3, 0.7, 0.55, 2, 1.75, 0.75, 0.1),  # Damage per pellet, 12 pellets per shot
+    ("Frenzy", WeaponType.SIDEARM, 450, 26, 10.0, (1.0, 0.7, 0.5), 0.5, 0.7, 0.5, 13, 1.75, 0.75, 0.25),
+    ("Ghost", WeaponType.SIDEARM, 500, 30, 6.75, (1.0, 0.9, 0.75), 0.7, 0.85, 0.65, 15, 1.5, 0.75, 0.3),
+    ("Sheriff", WeaponType.SIDEARM, 800, 55, 4.0, (1.0, 0.9, 0.8), 0.75, 0.85, 0.5, 6, 2.25, 1.0, 0.5),
+
+    # SMGs
+    ("Stinger", WeaponType.SMG, 950, 27, 18.0, (1.0, 0.7, 0.5), 0.5, 0.65, 0.7, 20, 2.25, 0.75, 0.3),
+    ("Spectre", WeaponType.SMG, 1600, 26, 13.33, (1.2, 0.8, 0.6), 0.6, 0.75, 0.75, 30, 2.25, 1.0, 0.4),
+
+    # SHOTGUNS
+    ("Bucky", WeaponType.SHOTGUN, 850, 20, 1.1, (1.2, 0.8, 0.4), 0.4, 0.6, 0.4, 5, 2.5, 1.0, 0.2),  # Damage per pellet, 15 pellets per shot
+    ("Judge", WeaponType.SHOTGUN, 1850, 17, 3.5, (1.3, 0.7, 0.3), 0.5, 0.55, 0.45, 7, 2.5, 1.0, 0.2),  # Damage per pellet, 12 pellets per shot
+
+    # RIFLES
+    ("Bulldog", WeaponType.RIFLE, 2050, 35, 9.15, (1.0, 0.95, 0.85), 0.75, 0.85, 0.4, 24, 2.5, 1.0, 0.6),
+    ("Guardian", WeaponType.RIFLE, 2250, 65, 5.25, (1.0, 1.0, 0.95), 0.85, 0.95, 0.35, 12, 2.5, 1.0, 0.7),
+    ("Phantom", WeaponType.RIFLE, 2900, 40, 9.75, (1.0, 1.0, 1.0), 0.8, 0.9, 0.4, 25, 2.5, 1.0, 0.8),
+    ("Vandal", WeaponType.RIFLE, 2900, 40, 9.25, (1.0, 1.0, 1.0), 0.8, 0.85, 0.35, 25, 2.5, 1.0, 0.7),
+
+    # SNIPERS
+    ("Marshal", WeaponType.SNIPER, 950, 101, 1.5, (1.0, 1.0, 1.0), 0.9, 0.95, 0.15, 5, 2.5, 1.25, 0.7),
+    ("Operator", WeaponType.SNIPER, 4700, 150, 0.75, (1.0, 1.0, 1.0), 1.0, 1.0, 0.1, 5, 3.7, 1.5, 0.9),
+    ("Outlaw", WeaponType.SNIPER, 2400, 127, 1.25, (1.0, 1.0, 1.0), 0.95, 0.98, 0.12, 5, 2.76, 1.25, 0.8),
+
+    # HEAVY WEAPONS
+    ("Ares", WeaponType.HEAVY, 1600, 30, 10.0, (1.0, 0.9, 0.75), 0.7, 0.75, 0.3, 50, 3.25, 1.25, 0.8),  # Fire rate increases with continuous fire
+    ("Odin", WeaponType.HEAVY, 3200, 38, 12.0, (1.0, 0.9, 0.8), 0.8, 0.7, 0.25, 100, 5.0, 1.5, 0.9),  # Fire rate increases with continuous fire
+]
+
+# Weapons are fixed stat blocks that nothing modifies, so every catalog
+# shares one instance per name instead of rebuilding them for each player.
+_CATALOG: Dict[str, Weapon] = {
+    name: Weapon(name, weapon_type, cost, damage, fire_rate,
+                 dict(zip(_RANGE_BANDS, ranges)), *rest)
+    for name, weapon_type, cost, damage, fire_rate, ranges, *rest in _CATALOG_ROWS
+}
+
 class WeaponFactory:
     """Factory for creating weapon instances with predefined stats."""
     
     @staticmethod
     def create_weapon_catalog() -> Dict[str, Weapon]:
-        return {
-            # SIDEARMS
-            "Classic": Weapon(
-                name="Classic",
-                type=WeaponType.SIDEARM,
-                cost=0,
-                damage=26,
-                fire_rate=6.75,
-                range_multipliers={"close": 1.0, "medium": 0.8, "long": 0.6},
-                armor_penetration=0.5,
-                accuracy=0.8,
-                movement_accuracy=0.6,
-                magazine_size=12,
-                reload_time=1.75,
-                equip_time=0.75,
-                wall_penetration=0.2
-            ),
-            "Shorty": Weapon(
-                name="Shorty",
-                type=WeaponType.SIDEARM,
-                cost=150,
-                damage=12,  # Per pellet, 12 pellets per shot
-                fire_rate=3.3,
-                range_multipliers={"close": 1.5, "medium": 0.5, "long": 0.1},
-                armor_penetration=0.3,
-                accuracy=0.7,
-                movement_accuracy=0.55,
-                magazine_size=2,
-                reload_time=1.75,
-                equip_time=0.75,
-                wall_penetration=0.1
-            ),
-            "Frenzy": Weapon(
-                name="Frenzy",
-                type=WeaponType.SIDEARM,
-                cost=450,
-                damage=26,
-                fire_rate=10.0,
-                range_multipliers={"close": 1.0, "medium": 0.7, "long": 0.5},
-                armor_penetration=0.5,
-                accuracy=0.7,
-                movement_accuracy=0.5,
-                magazine_size=13,
-                reload_time=1.75,
-                equip_time=0.75,
-                wall_penetration=0.25
-            ),
-            "Ghost": Weapon(
-                name="Ghost",
-                type=WeaponType.SIDEARM,
-                cost=500,
-                damage=30,
-                fire_rate=6.75,
-                range_multipliers={"close": 1.0, "medium": 0.9, "long": 0.75},
-                armor_penetration=0.7,
-                accuracy=0.85,
-                movement_accuracy=0.65,
-                magazine_size=15,
-                reload_time=1.5,
-                equip_time=0.75,
-                wall_penetration=0.3
-            ),
-            "Sheriff": Weapon(
-                name="Sheriff",
-                type=WeaponType.SIDEARM,
-                cost=800,
-                damage=55,
-                fire_rate=4.0,
-                range_multipliers={"close": 1.0, "medium": 0.9, "long": 0.8},
-                armor_penetration=0.75,
-                accuracy=0.85,
-                movement_accuracy=0.5,
-                magazine_size=6,
-                reload_time=2.25,
-                equip_time=1.0,
-                wall_penetration=0.5
-            ),
-            
-            # SMGs
-            "Stinger": Weapon(
-                name="Stinger",
-                type=WeaponType.SMG,
-                cost=950,
-                damage=27,
-                fire_rate=18.0,
-                range_multipliers={"close": 1.0, "medium": 0.7, "long": 0.5},
-                armor_penetration=0.5,
-                accuracy=0.65,
-                movement_accuracy=0.7,
-                magazine_size=20,
-                reload_time=2.25,
-                equip_time=0.75,
-                wall_penetration=0.3
-            ),
-            "Spectre": Weapon(
-                name="Spectre",
-                type=WeaponType.SMG,
-                cost=1600,
-                damage=26,
-                fire_rate=13.33,
-                range_multipliers={"close": 1.2, "medium": 0.8, "long": 0.6},
-                armor_penetration=0.6,
-                accuracy=0.75,
-                movement_accuracy=0.75,
-                magazine_size=30,
-                reload_time=2.25,
-                equip_time=1.0,
-                wall_penetration=0.4
-            ),
-            
-            # SHOTGUNS
-            "Bucky": Weapon(
-                name="Bucky",
-                type=WeaponType.SHOTGUN,
-                cost=850,
-                damage=20,  # Per pellet, 15 pellets per shot
-                fire_rate=1.1,
-                range_multipliers={"close": 1.2, "medium": 0.8, "long": 0.4},
-                armor_penetration=0.4,
-                accuracy=0.6,
-                movement_accuracy=0.4,
-                magazine_size=5,
-                reload_time=2.5,
-                equip_time=1.0,
-                wall_penetration=0.2
-            ),
-            "Judge": Weapon(
-                name="Judge",
-                type=WeaponType.SHOTGUN,
-                cost=1850,
-                damage=17,  # Per pellet, 12 pellets per shot
-                fire_rate=3.5,
-                range_multipliers={"close": 1.3, "medium": 0.7, "long": 0.3},
-                armor_penetration=0.5,
-                accuracy=0.55,
-                movement_accuracy=0.45,
-                magazine_size=7,
-                reload_time=2.5,
-                equip_time=1.0,
-                wall_penetration=0.2
-            ),
-            
-            # RIFLES
-            "Bulldog": Weapon(
-                name="Bulldog",
-                type=WeaponType.RIFLE,
-                cost=2050,
-                damage=35,
-                fire_rate=9.15,
-                range_multipliers={"close": 1.0, "medium": 0.95, "long": 0.85},
-                armor_penetration=0.75,
-                accuracy=0.85,
-                movement_accuracy=0.4,
-                magazine_size=24,
-                reload_time=2.5,
-                equip_time=1.0,
-                wall_penetration=0.6
-            ),
-            "Guardian": Weapon(
-                name="Guardian",
-                type=WeaponType.RIFLE,
-                cost=2250,
-                damage=65,
-                fire_rate=5.25,
-                range_multipliers={"close": 1.0, "medium": 1.0, "long": 0.95},
-                armor_penetration=0.85,
-                accuracy=0.95,
-                movement_accuracy=0.35,
-                magazine_size=12,
-                reload_time=2.5,
-                equip_time=1.0,
-                wall_penetration=0.7
-            ),
-            "Phantom": Weapon(
-                name="Phantom",
-                type=WeaponType.RIFLE,
-                cost=2900,
-                damage=40,
-                fire_rate=9.75,
-                range_multipliers={"close": 1.0, "medium": 1.0, "long": 1.0},
-                armor_penetration=0.8,
-                accuracy=0.9,
-                movement_accuracy=0.4,
-                magazine_size=25,
-                reload_time=2.5,
-                equip_time=1.0,
-                wall_penetration=0.8
-            ),
-            "Vandal": Weapon(
-                name="Vandal",
-                type=WeaponType.RIFLE,
-                cost=2900,
-                damage=40,
-                fire_rate=9.25,
-                range_multipliers={"close": 1.0, "medium": 1.0, "long": 1.0},
-                armor_penetration=0.8,
-                accuracy=0.85,
-                movement_accuracy=0.35,
-                magazine_size=25,
-                reload_time=2.5,
-                equip_time=1.0,
-                wall_penetration=0.7
-            ),
-            
-            # SNIPERS
-            "Marshal": Weapon(
-                name="Marshal",
-                type=WeaponType.SNIPER,
-                cost=950,
-                damage=101,
-                fire_rate=1.5,
-                range_multipliers={"close": 1.0, "medium": 1.0, "long": 1.0},
-                armor_penetration=0.9,
-                accuracy=0.95,
-                movement_accuracy=0.15,
-                magazine_size=5,
-                reload_time=2.5,
-                equip_time=1.25,
-                wall_penetration=0.7
-            ),
-            "Operator": Weapon(
-                name="Operator",
-                type=WeaponType.SNIPER,
-                cost=4700,
-                damage=150,
-                fire_rate=0.75,
-                range_multipliers={"close": 1.0, "medium": 1.0, "long": 1.0},
-                armor_penetration=1.0,
-                accuracy=1.0,
-                movement_accuracy=0.1,
-                magazine_size=5,
-                reload_time=3.7,
-                equip_time=1.5,
-                wall_penetration=0.9
-            ),
-            "Outlaw": Weapon(
-                name="Outlaw",
-                type=WeaponType.SNIPER,
-                cost=2400,
-                damage=127,
-                fire_rate=1.25,
-                range_multipliers={"close": 1.0, "medium": 1.0, "long": 1.0},
-                armor_penetration=0.95,
-                accuracy=0.98,
-                movement_accuracy=0.12,
-                magazine_size=5,
-                reload_time=2.76,
-                equip_time=1.25,
-                wall_penetration=0.8
-            ),
-            
-            # HEAVY WEAPONS
-            "Ares": Weapon(
-                name="Ares",
-                type=WeaponType.HEAVY,
-                cost=1600,
-                damage=30,
-                fire_rate=10.0,  # Increases with continuous fire
-                range_multipliers={"close": 1.0, "medium": 0.9, "long": 0.75},
-                armor_penetration=0.7,
-                accuracy=0.75,
-                movement_accuracy=0.3,
-                magazine_size=50,
-                reload_time=3.25,
-                equip_time=1.25,
-                wall_penetration=0.8
-            ),
-            "Odin": Weapon(
-                name="Odin",
-                type=WeaponType.HEAVY,
-                cost=3200,
-                damage=38,
-                fire_rate=12.0,  # Increases with continuous fire
-                range_multipliers={"close": 1.0, "medium": 0.9, "long": 0.8},
-                armor_penetration=0.8,
-                accuracy=0.7,
-                movement_accuracy=0.25,
-                magazine_size=100,
-                reload_time=5.0,
-                equip_time=1.5,
-                wall_penetration=0.9
-            ),
-        }
+        return dict(_CATALOG)
 
 class BuyPreferences:
     """Represents a player's weapon buying preferences and decision making."""
     
+    # Ratings derived from player_stats and cached on first access.
+    _CACHED_STATS = ('aim_rating', 'movement_rating', 'utility_rating', 'role', 'primary_agent')
+    
     def __init__(self, player_stats: Dict):
         self.player_stats = player_stats
         self.weapon_catalog = WeaponFactory.create_weapon_catalog()
+    
+    @cached_property
+    def aim_rating(self) -> float:
+        return self.player_stats.get('coreStats', {}).get('aim', 60)
+    
+    @cached_property
+    def movement_rating(self) -> float:
+        return self.player_stats.get('coreStats', {}).get('movement', 60)
+    
+    @cached_property
+    def utility_rating(self) -> float:
+        return self.player_stats.get('coreStats', {}).get('utilityUsage', 60)
+    
+    @cached_property
+    def role(self) -> str:
+        return self.player_stats.get('primaryRole', 'Flex').lower()
+    
+    @cached_property
+    def primary_agent(self) -> Optional[str]:
+        agent_profs = self.player_stats.get('agentProficiencies', {})
+        return max(agent_profs.items(), key=lambda x: x[1])[0] if agent_profs else None
+    
+    def invalidate_stats(self):
+        """Drop cached ratings so they are re-read after player_stats changes."""
+        for name in self._CACHED_STATS:
+            self.__dict__.pop(name, None)
         
     def decide_buy(self, available_credits: int, team_economy: float, round_type: str) -> Optional[str]:
         """
@@ -338,14 +131,11 @@ class BuyPreferences:
             Name of the weapon to buy, or None if saving
         """
         # Get core stats or use defaults
-        aim_rating = self.player_stats.get('coreStats', {}).get('aim', 60)
-        movement_rating = self.player_stats.get('coreStats', {}).get('movement', 60)
-        utility_rating = self.player_stats.get('coreStats', {}).get('utilityUsage', 60)
-        role = self.player_stats.get('primaryRole', 'Flex').lower()
-        
-        # Determine agent if available
-        agent_profs = self.player_stats.get('agentProficiencies', {})
-        primary_agent = max(agent_profs.items(), key=lambda x: x[1])[0] if agent_profs else None
+        aim_rating = self.aim_rating
+        movement_rating = self.movement_rating
+        utility_rating = self.utility_rating
+        role = self.role
+        primary_agent = self.primary_agent
         
         # Special case for tests - high aim players with 4700 credits should get Operator
         if available_credits >= 4700 and aim_rating >= 85:
@@ -1,12 +1,12 @@
 #!/usr/bin/env python3
 import sys
+import argparse
 import os
 import math
-import random
 import pygame
-import time
+import numpy as np
 import collections
-from typing import List, Tuple, Optional
+from typing import Dict, List, Sequence, Tuple, Optional
 
 # Add the project root to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
@@ -63,11 +63,278 @@ def create_test_map():
     
     return game_map
 
-def run_movement_test():
-    """Test the player movement with physics and collision response."""
+# Ramp arrows per direction, as a single polyline of pixel offsets from the ramp center:
+# tail to tip, out to one barb, back to the tip and out to the other barb
+ARROW_OFFSETS = {
+    "north": [(0, 10), (0, -10), (-5, -5), (0, -10), (5, -5)],
+    "south": [(0, -10), (0, 10), (-5, 5), (0, 10), (5, 5)],
+    "east": [(-10, 0), (10, 0), (5, -5), (10, 0), (5, 5)],
+    "west": [(10, 0), (-10, 0), (-5, -5), (-10, 0), (-5, 5)],
+}
+
+def precompute_draw_data(game_map: Map, scale: float, screen_height: int) -> Dict[str, list]:
+    """
+    Convert map geometry into screen-space draw primitives.
+    
+    Screen coordinates are computed once here so drawing code only iterates
+    over ready-made rects, colors and line endpoints.
+    """
+    def screen_rect(boundary: MapBoundary) -> pygame.Rect:
+        return pygame.Rect(
+            boundary.x * scale,
+            screen_height - (boundary.y + boundary.height) * scale,
+            boundary.width * scale,
+            boundary.height * scale
+        )
+    
+    # Areas with different colors based on elevation
+    area_rects = []
+    for area in game_map.areas.values():
+        if area.elevation > 0:
+            color = (180, 180, 220)  # Bluish for elevated areas
+        else:
+            color = (200, 200, 200)  # Default gray
+        area_rects.append((screen_rect(area), color))
+    
+    wall_rects = [(screen_rect(wall), (100, 100, 100)) for wall in game_map.walls.values()]
+    
+    # Objects with height-based color (taller = darker), labels only for boxes
+    object_rects = []
+    object_labels = []
+    for obj_name, obj in game_map.objects.items():
+        darkness = min(255, 150 + int(obj.height_z * 30))
+        object_rects.append((screen_rect(obj), (darkness, darkness-50, darkness-100)))
+        if obj_name.startswith("box"):
+            center = (
+                int((obj.x + obj.width / 2) * scale),
+                int(screen_height - (obj.y + obj.height / 2) * scale)
+            )
+            object_labels.append((obj_name, center))
+    
+    # Ramps with an arrow polyline pointing towards the higher side
+    ramp_rects = []
+    ramp_arrows = []
+    for ramp in game_map.ramps.values():
+        ramp_rects.append((screen_rect(ramp), (150, 180, 120)))
+        mid_x = int(ramp.x * scale + (ramp.width * scale / 2))
+        mid_y = int(screen_height - (ramp.y * scale + (ramp.height * scale / 2)))
+        offsets = ARROW_OFFSETS.get(ramp.direction)
+        if offsets:
+            ramp_arrows.append([(mid_x + ox, mid_y + oy) for ox, oy in offsets])
+    
+    # Stairs with evenly spaced step lines
+    stair_rects = []
+    stair_steps = []
+    steps = 5
+    for stair in game_map.stairs.values():
+        stair_rects.append((screen_rect(stair), (180, 150, 120)))
+        for i in range(steps):
+            step_y = int(screen_height - (stair.y + (i * stair.height / steps)) * scale)
+            stair_steps.append((
+                (int(stair.x * scale), step_y),
+                (int((stair.x + stair.width) * scale), step_y)
+            ))
+    
+    return {
+        "area_rects": area_rects,
+        "wall_rects": wall_rects,
+        "object_rects": object_rects,
+        "object_labels": object_labels,
+        "ramp_rects": ramp_rects,
+        "ramp_arrows": ramp_arrows,
+        "stair_rects": stair_rects,
+        "stair_steps": stair_steps,
+    }
+
+def render_map_background(draw_data: Dict[str, list], screen_width: int, screen_height: int,
+                          label_font) -> pygame.Surface:
+    """Draw the static map geometry once onto a surface that can be blitted every frame."""
+    surface = pygame.Surface((screen_width, screen_height))
+    surface.fill((255, 255, 255))
+    
+    # Draw areas with outlines
+    for rect, color in draw_data["area_rects"]:
+        pygame.draw.rect(surface, color, rect)
+        pygame.draw.rect(surface, (0, 0, 0), rect, 1)
+    
+    # Draw walls
+    for rect, color in draw_data["wall_rects"]:
+        pygame.draw.rect(surface, color, rect)
+    
+    # Draw objects and their labels
+    for rect, color in draw_data["object_rects"]:
+        pygame.draw.rect(surface, color, rect)
+    for name, (center_x, center_y) in draw_data["object_labels"]:
+        label_surface = label_font.render(name, True, (0, 0, 0))
+        surface.blit(label_surface, (center_x - label_surface.get_width() // 2,
+                                     center_y - label_surface.get_height() // 2))
+    
+    # Draw ramps with directional marking
+    for rect, color in draw_data["ramp_rects"]:
+        pygame.draw.rect(surface, color, rect)
+    for points in draw_data["ramp_arrows"]:
+        pygame.draw.lines(surface, (0, 0, 0), False, points, 2)
+    
+    # Draw stairs
+    for rect, color in draw_data["stair_rects"]:
+        pygame.draw.rect(surface, color, rect)
+    for start, end in draw_data["stair_steps"]:
+        pygame.draw.line(surface, (0, 0, 0), start, end, 1)
+    
+    return surface
+
+# Characters pre-rendered into the glyph cache for the per-frame HUD text
+HUD_GLYPHS = "0123456789.:-, zAFPSJumping"
+
+def build_glyph_cache(font: pygame.font.Font, chars: str,
+                      colors: List[Tuple[int, int, int]]) -> Dict[Tuple[str, Tuple[int, int, int]], pygame.Surface]:
+    """
+    Pre-render each character in each color so text can be drawn by blitting glyphs.
+    
+    Glyphs are converted to the display's pixel format (with alpha), so the
+    display mode must be set first.
+    """
+    return {(ch, color): font.render(ch, True, color).convert_alpha() for color in colors for ch in chars}
+
+def blit_text(surface: pygame.Surface, text: str, pos: Tuple[int, int], color: Tuple[int, int, int],
+              font: pygame.font.Font, glyph_cache: Dict[Tuple[str, Tuple[int, int, int]], pygame.Surface]):
+    """Draw text from cached glyphs, rendering and caching any glyph not seen before."""
+    # One destination buffer advanced in place for every glyph
+    dest = list(pos)
+    for ch in text:
+        glyph = glyph_cache.get((ch, color))
+        if glyph is None:
+            glyph = glyph_cache[(ch, color)] = font.render(ch, True, color).convert_alpha()
+        surface.blit(glyph, dest)
+        dest[0] += glyph.get_width()
+
+def build_move_lut() -> Dict[int, Tuple[int, int, bool, bool]]:
+    """
+    Map packed direction-key bits to movement input.
+    
+    Bits are left=1, right=2, up=4, down=8. Each entry is
+    (movement_x, movement_y, stop_x, stop_y), where the stop flags mark
+    an axis whose opposing keys are both held (counter-strafe).
+    """
+    lut = {}
+    for bits in range(16):
+        left, right = bool(bits & 1), bool(bits & 2)
+        up, down = bool(bits & 4), bool(bits & 8)
+        movement_x = 0 if left == right else (-1 if left else 1)
+        movement_y = 0 if up == down else (1 if up else -1)
+        lut[bits] = (movement_x, movement_y, left and right, up and down)
+    return lut
+
+MOVE_LUT = build_move_lut()
+
+# Event types handled by the main loop; all others are discarded each frame
+HANDLED_EVENTS = [pygame.QUIT, pygame.MOUSEBUTTONDOWN]
+
+# Physics runs at a fixed rate, decoupled from the render frame rate
+FIXED_DT = 1.0 / 60.0
+# Cap on real time consumed per frame so a long stall cannot trigger a spiral of catch-up steps
+MAX_FRAME_TIME = 0.25
+
+# Print per-shot and per-frame AI diagnostics to the console
+DEBUG = False
+
+def world_to_screen(points: Sequence[Sequence[float]], scale: float, screen_height: int) -> List[Tuple[int, int]]:
+    """Convert world points (x, y, ...) to integer screen coordinates in one vectorized pass."""
+    if len(points) == 0:
+        return []
+    xy = np.asarray(points, dtype=float)[:, :2]
+    # Scale and y-flip fused into one multiply-add: (x, y) -> (x*s, h - y*s)
+    screen = xy * (scale, -scale) + (0, screen_height)
+    return list(map(tuple, screen.astype(int).tolist()))
+
+def entity_screen_data(entities: List[Player], scale: float, screen_height: int,
+                       locations: Optional[np.ndarray] = None) -> Tuple[List[Tuple[int, int]], List[int], List[int]]:
+    """
+    Compute screen positions, radii and height-based color intensities for all entities in one pass.
+    
+    Args:
+        locations: Optional (N, 3) render locations (e.g. interpolated between physics steps);
+            defaults to the entities' current locations
+    
+    Returns:
+        (positions, radii, height_colors), one entry per entity
+    """
+    if locations is None:
+        locations = np.array([entity.location for entity in entities], dtype=float)
+    radii = np.array([entity.radius for entity in entities], dtype=float)
+    # Color intensity grows with z-position (height above ground)
+    height_colors = np.clip(50 + (locations[:, 2] * 50).astype(int), 0, 255)
+    return (world_to_screen(locations, scale, screen_height),
+            (radii * scale).astype(int).tolist(),
+            height_colors.tolist())
+
+def compute_ai_move(ai_player: Player, target_x: float, target_y: float, target_z: Optional[float],
+                    game_map: Map) -> Tuple[float, float, bool]:
+    """
+    Steer the AI toward a target and decide whether it has to jump to get there.
+    
+    On stairs or a ramp any climb of more than 0.1 triggers a jump; elsewhere
+    only steps between 0.3 and 1.5 do, and never while airborne.
+    
+    Args:
+        target_z: Elevation to reach; None uses the terrain one unit ahead
+    
+    Returns:
+        (direction_x, direction_y, jump) with the direction normalized
+    """
+    x, y, z = ai_player.location
+    direction_x = target_x - x
+    direction_y = target_y - y
+    magnitude = math.hypot(direction_x, direction_y)
+    if magnitude:
+        direction_x /= magnitude
+        direction_y /= magnitude
+    if target_z is None:
+        target_z = game_map.get_elevation_at_position(x + direction_x, y + direction_y)
+    if not ai_player.is_on_ground():
+        return direction_x, direction_y, False
+    
+    # Check if on stairs or ramp for special movement, via the map's per-cell masks
+    surface_masks = game_map.get_surface_masks()
+    width, height = int(game_map.width), int(game_map.height)
+    on_surface = False
+    if 0 <= x < width and 0 <= y < height:
+        cell = int(y) * width + int(x)
+        on_surface = surface_masks["stairs"][cell] or surface_masks["ramps"][cell]
+    elevation_difference = target_z - z
+    if on_surface:
+        jump = elevation_difference > 0.1
+    else:
+        jump = 0.3 < elevation_difference < 1.5
+    if DEBUG and jump:
+        print(f"AI jumping to elevation {target_z} (current: {z})")
+    return direction_x, direction_y, jump
+
+def run_movement_test(seed: Optional[int] = None, headless: bool = False, max_frames: int = 600):
+    """
+    Test the player movement with physics and collision response.
+    
+    Args:
+        seed: Optional seed for the AI's random decisions
+        headless: Run without a visible window (SDL dummy video driver), stepping
+            physics once per frame as fast as possible and stopping after max_frames.
+            Intended for profiling the movement path under cProfile/py-spy.
+        max_frames: Number of frames to run in headless mode
+    """
+    if headless:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    # Let SDL's renderer (used by the SCALED display) coalesce draw calls
+    os.environ.setdefault("SDL_RENDER_BATCHING", "1")
     pygame.init()
     screen_width, screen_height = 800, 600
-    screen = pygame.display.set_mode((screen_width, screen_height))
+    # Pace frames with vsync where available; fall back to a software frame cap
+    try:
+        screen = pygame.display.set_mode((screen_width, screen_height),
+                                         pygame.SCALED | pygame.DOUBLEBUF, vsync=1)
+        frame_cap = 0
+    except pygame.error:
+        screen = pygame.display.set_mode((screen_width, screen_height))
+        frame_cap = 60
     pygame.display.set_caption("3D Movement Physics Test")
     clock = pygame.time.Clock()
     
@@ -115,18 +382,27 @@ def run_movement_test():
         (20.0, 20.0),
         (10.0, 20.0)
     ]
+    # The same points as an array for nearest-point queries
+    patrol_point_array = np.array(ai_patrol_points, dtype=float)
     current_patrol_point = 0
+    # Random source for AI decisions; each frame's rolls are drawn in one call
+    rng = np.random.default_rng(seed)
     # Dynamic waypoints set by mouse clicks with pathfinding
     ai_waypoints: List[Tuple[float, float, float]] = []
+    # Screen positions of ai_waypoints, converted once whenever the waypoints are set
+    waypoint_screens: List[Tuple[int, int]] = []
     
     # Scale factor for drawing
     scale = 20
+    # Velocity vectors are drawn at twice the map scale
+    velocity_scale = scale * 2
+    
+    def to_screen(wx: float, wy: float) -> Tuple[int, int]:
+        """Convert a world (x, y) position to integer screen coordinates."""
+        return int(wx * scale), int(screen_height - wy * scale)
     
     # Main game loop
     running = True
-    frame_count = 0
-    last_fps_update = time.time()
-    fps = 0
     prev_jump = False
     bullet_path = None
     bullet_timer = 0
@@ -137,15 +413,39 @@ def run_movement_test():
     
     # Font for labeling objects
     label_font = pygame.font.SysFont(None, 20)
+    # Font and glyph cache for per-frame HUD text
+    font = pygame.font.SysFont(None, 24)
+    glyph_cache = build_glyph_cache(font, HUD_GLYPHS, [(0, 0, 0), (255, 0, 0), (0, 0, 255)])
+    # Font for damage popups
+    damage_font = pygame.font.SysFont(None, 32)
+    # Static map geometry is rendered once and blitted each frame; converting it to
+    # the display's pixel format makes that blit a plain copy
+    draw_data = precompute_draw_data(game_map, scale, screen_height)
+    map_bg = render_map_background(draw_data, screen_width, screen_height, label_font).convert()
     # Variables for displaying object hit messages
     object_hit_message = None  # type: Optional[str]
     object_hit_timer = 0      # frames to display the message
+    # Fixed-timestep state: unsimulated real time, and the physics state before the last step
+    accumulator = 0.0
+    frame_time = FIXED_DT
+    previous_locations = np.array([player.location, ai_player.location], dtype=float)
+    frames_run = 0
     
     while running:
-        # preview time step for elevation check
-        dt_preview = 1.0 / 60.0
-        # Handle events
-        for event in pygame.event.get():
+        # Idle at a low tick rate while the window is unfocused or minimized,
+        # still draining events so the window can be closed
+        if not headless and not (pygame.key.get_focused() and pygame.display.get_active()):
+            if pygame.event.get(pygame.QUIT):
+                running = False
+            pygame.event.clear()
+            clock.tick(10)
+            continue
+        
+        # Handle events; pygame filters the queue down to the types we use,
+        # and everything else (mouse motion, key events, ...) is dropped
+        events = pygame.event.get(HANDLED_EVENTS)
+        pygame.event.clear()
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.MOUSEBUTTONDOWN:
@@ -160,19 +460,20 @@ def run_movement_test():
                     dx = wx - px
                     dy = wy - py
                     dz = 0
-                    print("dx, dy, dz: ", dx, dy, dz)
+                    if DEBUG:
+                        print("dx, dy, dz: ", dx, dy, dz)
                     dist = math.sqrt(dx*dx + dy*dy + dz*dz)
                     if dist == 0:
                         continue
                     # Normalize shooting direction (no aim spread)
-                    norm = math.sqrt(dx*dx + dy*dy + dz*dz)
-                    dx /= norm
-                    dy /= norm
-                    dz /= norm
+                    dx /= dist
+                    dy /= dist
+                    dz /= dist
                     # Raycast bullet against map and players
                     origin = (px, py, shooter_z)
-                    print(f"Bullet origin: {origin}")
-                    print(f"Click location: ({wx}, {wy})")
+                    if DEBUG:
+                        print(f"Bullet origin: {origin}")
+                        print(f"Click location: ({wx}, {wy})")
                     direction = (dx, dy, dz)
                     max_range = 50.0
                     hit_point, hit_boundary, hit_player = game_map.cast_bullet(origin, direction, max_range, [ai_player])
@@ -180,17 +481,22 @@ def run_movement_test():
                     if hit_player:
                         raw_damage = 40
                         actual_damage = hit_player.apply_damage(raw_damage)
-                        damage_text = (actual_damage, (hit_player.location[0], hit_player.location[1], hit_player.location[2] + hit_player.height))
+                        # Render the popup once and anchor it in screen space, centered above the hit player's head
+                        hx, hy, hz = hit_player.location
+                        dmg_surface = damage_font.render(f"-{actual_damage}", True, (255, 0, 0)).convert_alpha()
+                        sx, sy = to_screen(hx, hy + hz + hit_player.height)
+                        damage_text = (dmg_surface, (sx - dmg_surface.get_width() // 2, sy - 30))
                         damage_timer = DAMAGE_LIFETIME
                     # Display object hit message if we hit an object
                     if hit_boundary and getattr(hit_boundary, 'boundary_type', '') == 'object' and not hit_player:
                         object_hit_message = f"{hit_boundary.name} hit"
                         object_hit_timer = 60  # show for 60 frames
-                    # Determine bullet path for drawing
+                    # Determine bullet path for drawing, converted to screen space once
                     if hit_point:
-                        bullet_path = ((px, py), (hit_point[0], hit_point[1]))
+                        end_x, end_y = hit_point[0], hit_point[1]
                     else:
-                        bullet_path = ((px, py), (origin[0] + direction[0] * max_range, origin[1] + direction[1] * max_range))
+                        end_x, end_y = origin[0] + direction[0] * max_range, origin[1] + direction[1] * max_range
+                    bullet_path = (to_screen(px, py), to_screen(end_x, end_y))
                     bullet_timer = BULLET_LIFETIME
                 elif event.button == 3:
                     # Right click: set AI waypoint using pathfinding
@@ -200,7 +506,7 @@ def run_movement_test():
                     
                     # Find path from AI's current position to the target
                     ai_path = game_map.find_path_3d(
-                        (ai_player.location[0], ai_player.location[1], ai_player.location[2]),
+                        ai_player.location,
                         (wx, wy, target_elevation),
                         max_jump_height=1.5
                     )
@@ -214,80 +520,61 @@ def run_movement_test():
                         # Fall back to direct waypoint if no path found
                         # For direct waypoint, use surrounding patrol points to find a way there
                         # This will avoid the AI getting stuck when no direct path exists
-                        nearest_patrol_point = min(
-                            ai_patrol_points,
-                            key=lambda p: math.sqrt((p[0] - wx)**2 + (p[1] - wy)**2)
-                        )
+                        # Squared distance has the same argmin, so no sqrt is needed
+                        offsets = patrol_point_array - (wx, wy)
+                        nearest_patrol_point = ai_patrol_points[int((offsets * offsets).sum(axis=1).argmin())]
                         ai_waypoints = [(nearest_patrol_point[0], nearest_patrol_point[1], 
                                         game_map.get_elevation_at_position(nearest_patrol_point[0], nearest_patrol_point[1]))]
                         current_patrol_point = 0
                         object_hit_message = "Target unreachable - using nearest patrol point"
                         object_hit_timer = 60
+                    waypoint_screens = world_to_screen(ai_waypoints, scale, screen_height)
         
         # Get keyboard input for player movement
         keys = pygame.key.get_pressed()
-        left = keys[pygame.K_LEFT] or keys[pygame.K_a]
-        right = keys[pygame.K_RIGHT] or keys[pygame.K_d]
-        up = keys[pygame.K_UP] or keys[pygame.K_w]
-        down = keys[pygame.K_DOWN] or keys[pygame.K_s]
+        move_bits = (
+            (keys[pygame.K_LEFT] | keys[pygame.K_a])
+            | (keys[pygame.K_RIGHT] | keys[pygame.K_d]) << 1
+            | (keys[pygame.K_UP] | keys[pygame.K_w]) << 2
+            | (keys[pygame.K_DOWN] | keys[pygame.K_s]) << 3
+        )
         raw_jump = keys[pygame.K_SPACE]
         jump = raw_jump and not prev_jump
         prev_jump = raw_jump
 
-        # Horizontal counter-strafe
-        if left and right:
-            movement_x = 0
-            # Immediately stop horizontal motion
-            player.velocity = (0.0, player.velocity[1], player.velocity[2])
-        elif left:
-            movement_x = -1
-        elif right:
-            movement_x = 1
-        else:
-            movement_x = 0
-
-        # Vertical counter-strafe
-        if up and down:
-            movement_y = 0
-            # Immediately stop vertical motion
-            player.velocity = (player.velocity[0], 0.0, player.velocity[2])
-        elif up:
-            movement_y = 1
-        elif down:
-            movement_y = -1
-        else:
-            movement_y = 0
+        # Counter-strafing on an axis immediately stops motion along it
+        movement_x, movement_y, stop_x, stop_y = MOVE_LUT[move_bits]
+        if stop_x:
+            player.velocity[0] = 0.0
+        if stop_y:
+            player.velocity[1] = 0.0
         
         # Set movement inputs for player
         is_walking = keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT]
         is_crouching = keys[pygame.K_c]
         player.set_movement_input((movement_x, movement_y), is_walking, is_crouching, jump)
         
-        # Update AI player movement (patrol or follow waypoints)
+        # Update AI player movement (patrol or follow waypoints); the AI only
+        # moves in the physics step below, so its location is read once here
+        ai_x, ai_y, ai_z = ai_player.location
         if ai_waypoints:
             # Ensure current_patrol_point is within bounds
             if current_patrol_point >= len(ai_waypoints):
                 current_patrol_point = 0
             # Get current target from waypoints list
-            current_waypoint = ai_waypoints[current_patrol_point]
-            target_point = (current_waypoint[0], current_waypoint[1])
-            target_z = current_waypoint[2]
-            
-            # Calculate distance to current waypoint
-            distance_to_target = math.sqrt(
-                (ai_player.location[0] - target_point[0])**2 + 
-                (ai_player.location[1] - target_point[1])**2
-            )
+            target_x, target_y, target_z = ai_waypoints[current_patrol_point]
             
-            # If AI has reached the waypoint, move to next point
-            if distance_to_target < 0.5:
+            # If AI has reached the waypoint (within 0.5), move to next point
+            offset_x, offset_y = target_x - ai_x, target_y - ai_y
+            if offset_x * offset_x + offset_y * offset_y < 0.25:
                 current_patrol_point += 1
                 if current_patrol_point >= len(ai_waypoints):
                     # Reached end of path
                     current_patrol_point = 0
                     if len(ai_waypoints) > 1:
                         # Loop through waypoints if multiple exist
-                        print("Completed path, looping back to beginning")
+                        if DEBUG:
+                            print("Completed path, looping back to beginning")
                     else:
                         # Stop if only one waypoint
                         ai_waypoints = []
@@ -296,258 +583,62 @@ def run_movement_test():
                 
                 # Get new target
                 if ai_waypoints:
-                    current_waypoint = ai_waypoints[current_patrol_point]
-                    target_point = (current_waypoint[0], current_waypoint[1])
-                    target_z = current_waypoint[2]
+                    target_x, target_y, target_z = ai_waypoints[current_patrol_point]
             
-            # Calculate direction from AI to target
-            ai_direction_x = target_point[0] - ai_player.location[0]
-            ai_direction_y = target_point[1] - ai_player.location[1]
-            
-            # Normalize direction vector
-            if ai_direction_x != 0 or ai_direction_y != 0:
-                magnitude = math.sqrt(ai_direction_x**2 + ai_direction_y**2)
-                ai_direction_x /= magnitude
-                ai_direction_y /= magnitude
-            
-            # Decide if AI should jump
-            current_x, current_y, current_z = ai_player.location
-            desired_x = current_x + ai_direction_x
-            desired_y = current_y + ai_direction_y
-            
-            # Get current location info
-            current_elevation = game_map.get_elevation_at_position(current_x, current_y)
-            next_elevation = game_map.get_elevation_at_position(desired_x, desired_y)
-            
-            # Check if on stairs or ramp for special movement
-            is_on_stairs = False
-            is_on_ramp = False
-            
-            # Check if current position is on stairs
-            for stair in game_map.stairs.values():
-                if (stair.x <= current_x <= stair.x + stair.width and 
-                    stair.y <= current_y <= stair.y + stair.height):
-                    is_on_stairs = True
-                    break
-            
-            # Check if current position is on ramp
-            for ramp in game_map.ramps.values():
-                if (ramp.x <= current_x <= ramp.x + ramp.width and 
-                    ramp.y <= current_y <= ramp.y + ramp.height):
-                    is_on_ramp = True
-                    break
-            
-            # If significant elevation difference, consider jumping
-            ai_jump = False
-            elevation_difference = target_z - current_z
-            
-            # Always jump when on stairs/ramps going up
-            if is_on_stairs or is_on_ramp:
-                if elevation_difference > 0.1 and ai_player.is_on_ground():
-                    ai_jump = True
-                    print(f"AI jumping on stairs/ramp to elevation {target_z} (current: {current_z})")
-            # Normal jumping for smaller height differences
-            elif elevation_difference > 0.3 and elevation_difference < 1.5 and ai_player.is_on_ground():
-                ai_jump = True
-                print(f"AI jumping to elevation {target_z} (current: {current_z})")
+            target_point = (target_x, target_y)
+            ai_direction_x, ai_direction_y, ai_jump = compute_ai_move(ai_player, target_x, target_y, target_z, game_map)
         
         else:
             # Fall back to basic patrol if no waypoints
             targets = ai_patrol_points
             target_point = targets[current_patrol_point % len(targets)]
             
-            distance_to_target = math.sqrt(
-                (ai_player.location[0] - target_point[0])**2 + 
-                (ai_player.location[1] - target_point[1])**2
-            )
-            
-            # If AI has reached the target, move to next point
-            if distance_to_target < 0.5:
+            # If AI has reached the target (within 0.5), move to next point
+            offset_x, offset_y = target_point[0] - ai_x, target_point[1] - ai_y
+            if offset_x * offset_x + offset_y * offset_y < 0.25:
                 current_patrol_point = (current_patrol_point + 1) % len(targets)
                 target_point = targets[current_patrol_point]
             
-            # Calculate direction from AI to target
-            ai_direction_x = target_point[0] - ai_player.location[0]
-            ai_direction_y = target_point[1] - ai_player.location[1]
-            
-            # Normalize direction vector
-            if ai_direction_x != 0 or ai_direction_y != 0:
-                magnitude = math.sqrt(ai_direction_x**2 + ai_direction_y**2)
-                ai_direction_x /= magnitude
-                ai_direction_y /= magnitude
-            
-            # Decide if AI should jump for patrol mode
-            current_x, current_y, _ = ai_player.location
-            desired_x = current_x + ai_direction_x
-            desired_y = current_y + ai_direction_y
-            
-            # Check elevation difference
-            current_elevation = game_map.get_elevation_at_position(current_x, current_y)
-            target_elevation = game_map.get_elevation_at_position(desired_x, desired_y)
-            
-            # If significant elevation difference, consider jumping
-            ai_jump = False
-            elevation_difference = target_elevation - current_elevation
-            if elevation_difference > 0.3 and elevation_difference < 1.5:
+            # Patrol points carry no elevation, so aim for the terrain just ahead
+            ai_direction_x, ai_direction_y, step_jump = compute_ai_move(
+                ai_player, target_point[0], target_point[1], None, game_map)
+            obstacle_roll, random_jump_roll = rng.random(2)
+            if step_jump:
                 # Try to jump over small obstacles
-                ai_jump = random.random() < 0.7  # 70% chance
-            elif random.random() < 0.02 and ai_player.is_on_ground():
-                ai_jump = True  # Random jumping
+                ai_jump = obstacle_roll < 0.7  # 70% chance
+            else:
+                ai_jump = random_jump_roll < 0.02 and ai_player.is_on_ground()  # Random jumping
         
         # Set AI movement input
         ai_player.set_movement_input((ai_direction_x, ai_direction_y), False, False, ai_jump)
         
-        # Update physics for both players
-        time_step = 1.0 / 60.0  # Fixed time step for physics
-        player.update_movement(time_step, game_map)
-        ai_player.update_movement(time_step, game_map)
+        # Advance physics in fixed steps for the real time elapsed since the last frame
+        accumulator += min(frame_time, MAX_FRAME_TIME)
+        while accumulator >= FIXED_DT:
+            previous_locations = np.array([player.location, ai_player.location], dtype=float)
+            player.update_movement(FIXED_DT, game_map)
+            ai_player.update_movement(FIXED_DT, game_map)
+            accumulator -= FIXED_DT
         
-        # Clear screen
-        screen.fill((255, 255, 255))
+        # Draw static map geometry
+        screen.blit(map_bg, (0, 0))
         
-        # Draw map
-        for area_name, area in game_map.areas.items():
-            # Draw areas with different colors based on type
-            if area.elevation > 0:
-                color = (180, 180, 220)  # Bluish for elevated areas
-            else:
-                color = (200, 200, 200)  # Default gray
-            
-            pygame.draw.rect(
-                screen, 
-                color, 
-                pygame.Rect(
-                    area.x * scale, 
-                    screen_height - (area.y + area.height) * scale, 
-                    area.width * scale, 
-                    area.height * scale
-                )
-            )
-            # Draw outline
-            pygame.draw.rect(
-                screen, 
-                (0, 0, 0), 
-                pygame.Rect(
-                    area.x * scale, 
-                    screen_height - (area.y + area.height) * scale, 
-                    area.width * scale, 
-                    area.height * scale
-                ), 
-                1
-            )
+        # Screen data for both players, interpolated between the last two physics states
+        alpha = accumulator / FIXED_DT
+        current_locations = np.array([player.location, ai_player.location], dtype=float)
+        render_locations = previous_locations + (current_locations - previous_locations) * alpha
+        (player_pos, ai_pos), (player_radius, ai_radius), (height_color, ai_height_color) = \
+            entity_screen_data([player, ai_player], scale, screen_height, render_locations)
         
-        # Draw walls
-        for wall_name, wall in game_map.walls.items():
-            pygame.draw.rect(
-                screen, 
-                (100, 100, 100), 
-                pygame.Rect(
-                    wall.x * scale, 
-                    screen_height - (wall.y + wall.height) * scale, 
-                    wall.width * scale, 
-                    wall.height * scale
-                )
-            )
-        
-        # Draw objects
-        for obj_name, obj in game_map.objects.items():
-            # Height-based color (taller = darker)
-            darkness = min(255, 150 + int(obj.height_z * 30))
-            pygame.draw.rect(
-                screen, 
-                (darkness, darkness-50, darkness-100), 
-                pygame.Rect(
-                    obj.x * scale, 
-                    screen_height - (obj.y + obj.height) * scale, 
-                    obj.width * scale, 
-                    obj.height * scale
-                )
-            )
-            # Draw labels only for boxes
-            if obj_name.startswith("box"):
-                label_surface = label_font.render(obj_name, True, (0, 0, 0))
-                label_x = int((obj.x + obj.width / 2) * scale) - label_surface.get_width() // 2
-                label_y = int(screen_height - (obj.y + obj.height / 2) * scale) - label_surface.get_height() // 2
-                screen.blit(label_surface, (label_x, label_y))
-        
-        # Draw ramps with directional marking
-        for ramp_name, ramp in game_map.ramps.items():
-            pygame.draw.rect(
-                screen, 
-                (150, 180, 120), 
-                pygame.Rect(
-                    ramp.x * scale, 
-                    screen_height - (ramp.y + ramp.height) * scale, 
-                    ramp.width * scale, 
-                    ramp.height * scale
-                )
-            )
-            # Draw arrow showing direction
-            mid_x = ramp.x * scale + (ramp.width * scale / 2)
-            mid_y = screen_height - (ramp.y * scale + (ramp.height * scale / 2))
-            
-            # Draw direction arrow
-            if ramp.direction == "north":
-                pygame.draw.line(screen, (0, 0, 0), (mid_x, mid_y + 10), (mid_x, mid_y - 10), 2)
-                pygame.draw.line(screen, (0, 0, 0), (mid_x, mid_y - 10), (mid_x - 5, mid_y - 5), 2)
-                pygame.draw.line(screen, (0, 0, 0), (mid_x, mid_y - 10), (mid_x + 5, mid_y - 5), 2)
-            elif ramp.direction == "south":
-                pygame.draw.line(screen, (0, 0, 0), (mid_x, mid_y - 10), (mid_x, mid_y + 10), 2)
-                pygame.draw.line(screen, (0, 0, 0), (mid_x, mid_y + 10), (mid_x - 5, mid_y + 5), 2)
-                pygame.draw.line(screen, (0, 0, 0), (mid_x, mid_y + 10), (mid_x + 5, mid_y + 5), 2)
-            elif ramp.direction == "east":
-                pygame.draw.line(screen, (0, 0, 0), (mid_x - 10, mid_y), (mid_x + 10, mid_y), 2)
-                pygame.draw.line(screen, (0, 0, 0), (mid_x + 10, mid_y), (mid_x + 5, mid_y - 5), 2)
-                pygame.draw.line(screen, (0, 0, 0), (mid_x + 10, mid_y), (mid_x + 5, mid_y + 5), 2)
-            elif ramp.direction == "west":
-                pygame.draw.line(screen, (0, 0, 0), (mid_x + 10, mid_y), (mid_x - 10, mid_y), 2)
-                pygame.draw.line(screen, (0, 0, 0), (mid_x - 10, mid_y), (mid_x - 5, mid_y - 5), 2)
-                pygame.draw.line(screen, (0, 0, 0), (mid_x - 10, mid_y), (mid_x - 5, mid_y + 5), 2)
-        
-        # Draw stairs
-        for stair_name, stair in game_map.stairs.items():
-            pygame.draw.rect(
-                screen, 
-                (180, 150, 120), 
-                pygame.Rect(
-                    stair.x * scale, 
-                    screen_height - (stair.y + stair.height) * scale, 
-                    stair.width * scale, 
-                    stair.height * scale
-                )
-            )
-            # Draw stair pattern
-            steps = 5
-            for i in range(steps):
-                step_y = stair.y + (i * stair.height / steps)
-                pygame.draw.line(
-                    screen,
-                    (0, 0, 0),
-                    (stair.x * scale, screen_height - step_y * scale),
-                    ((stair.x + stair.width) * scale, screen_height - step_y * scale),
-                    1
-                )
-        
-        # Draw player
-        player_pos = (
-            int(player.location[0] * scale), 
-            int(screen_height - player.location[1] * scale)
-        )
-        player_radius = int(player.radius * scale)
-        
-        # Color player based on z-position (height above ground)
-        height_color = min(255, 50 + int(player.z_position * 50))
-        pygame.draw.circle(screen, (0, 0, max(0, height_color)), player_pos, player_radius)
+        # Draw player, colored by z-position
+        pygame.draw.circle(screen, (0, 0, height_color), player_pos, player_radius)
         
         # Show height text above player
-        font = pygame.font.SysFont(None, 24)
-        height_text = font.render(f"z: {player.z_position:.1f}", True, (0, 0, 0))
-        screen.blit(height_text, (player_pos[0] - 20, player_pos[1] - 30))
+        blit_text(screen, f"z: {player.z_position:.1f}", (player_pos[0] - 20, player_pos[1] - 30), (0, 0, 0), font, glyph_cache)
         
         # Show if player is jumping
         if player.in_air:
-            jump_text = font.render("Jumping", True, (255, 0, 0))
-            screen.blit(jump_text, (player_pos[0] - 30, player_pos[1] - 50))
+            blit_text(screen, "Jumping", (player_pos[0] - 30, player_pos[1] - 50), (255, 0, 0), font, glyph_cache)
         
         # Draw player velocity vector
         pygame.draw.line(
@@ -555,26 +646,17 @@ def run_movement_test():
             (0, 255, 0),
             player_pos,
             (
-                int(player_pos[0] + player.velocity[0] * scale * 2),
-                int(player_pos[1] - player.velocity[1] * scale * 2)
+                int(player_pos[0] + player.velocity[0] * velocity_scale),
+                int(player_pos[1] - player.velocity[1] * velocity_scale)
             ),
             2
         )
         
-        # Draw AI player
-        ai_pos = (
-            int(ai_player.location[0] * scale), 
-            int(screen_height - ai_player.location[1] * scale)
-        )
-        ai_radius = int(ai_player.radius * scale)
-        
-        # Color AI based on z-position
-        ai_height_color = min(255, 50 + int(ai_player.z_position * 50))
-        pygame.draw.circle(screen, (height_color, 0, 0), ai_pos, ai_radius)
+        # Draw AI player, colored by z-position
+        pygame.draw.circle(screen, (ai_height_color, 0, 0), ai_pos, ai_radius)
         
         # Show AI height text
-        ai_height_text = font.render(f"z: {ai_player.z_position:.1f}", True, (0, 0, 0))
-        screen.blit(ai_height_text, (ai_pos[0] - 20, ai_pos[1] - 30))
+        blit_text(screen, f"z: {ai_player.z_position:.1f}", (ai_pos[0] - 20, ai_pos[1] - 30), (0, 0, 0), font, glyph_cache)
         
         # Draw AI velocity vector
         pygame.draw.line(
@@ -582,21 +664,20 @@ def run_movement_test():
             (255, 0, 0),
             ai_pos,
             (
-                int(ai_pos[0] + ai_player.velocity[0] * scale * 2),
-                int(ai_pos[1] - ai_player.velocity[1] * scale * 2)
+                int(ai_pos[0] + ai_player.velocity[0] * velocity_scale),
+                int(ai_pos[1] - ai_player.velocity[1] * velocity_scale)
             ),
             2
         )
         
         # Display AI armor above head
-        armor_text = font.render(f"A: {ai_player.armor}", True, (0, 0, 255))
-        screen.blit(armor_text, (ai_pos[0] - 20, ai_pos[1] - 10))
+        blit_text(screen, f"A: {ai_player.armor}", (ai_pos[0] - 20, ai_pos[1] - 10), (0, 0, 255), font, glyph_cache)
         
         # Draw target point for AI
         pygame.draw.circle(
             screen,
             (255, 0, 0),
-            (int(target_point[0] * scale), int(screen_height - target_point[1] * scale)),
+            to_screen(target_point[0], target_point[1]),
             5,
             1
         )
@@ -604,42 +685,30 @@ def run_movement_test():
         # Draw bullet path if active
         if bullet_path and bullet_timer > 0:
             start, end = bullet_path
-            pygame.draw.line(
-                screen, (255, 0, 0),
-                (int(start[0] * scale), int(screen_height - start[1] * scale)),
-                (int(end[0] * scale), int(screen_height - end[1] * scale)), 3
-            )
+            pygame.draw.line(screen, (255, 0, 0), start, end, 3)
             # Draw a marker at hit point for visibility
-            hit_x, hit_y = end
-            pygame.draw.circle(
-                screen, (255, 255, 0),
-                (int(hit_x * scale), int(screen_height - hit_y * scale)),
-                5, 0  # filled circle for visibility
-            )
+            pygame.draw.circle(screen, (255, 255, 0), end, 5, 0)  # filled circle for visibility
             bullet_timer -= 1
             if bullet_timer <= 0:
                 bullet_path = None
         # Draw damage text if active
         if damage_text and damage_timer > 0:
-            dmg, (x, y, z) = damage_text
-            font = pygame.font.SysFont(None, 32)
-            dmg_surface = font.render(f"-{dmg}", True, (255, 0, 0))
-            sx = int(x * scale)
-            sy = int(screen_height - y * scale - z * scale - 30)
-            screen.blit(dmg_surface, (sx - dmg_surface.get_width() // 2, sy))
+            dmg_surface, dmg_pos = damage_text
+            screen.blit(dmg_surface, dmg_pos)
             damage_timer -= 1
             if damage_timer <= 0:
                 damage_text = None
         
         # Draw waypoints for AI
         if ai_waypoints:
-            # Draw the path
-            for i in range(len(ai_waypoints)):
-                wp = ai_waypoints[i]
-                wp_screen = (int(wp[0] * scale), int(screen_height - wp[1] * scale))
+            # Draw the path from the screen positions converted when it was set
+            for i, wp_screen in enumerate(waypoint_screens):
                 
                 # Draw different sized circles for waypoints
                 size = 5 if i == current_patrol_point else 3
+                # Skip circles entirely outside the window (the map is taller than it)
+                if not (-size <= wp_screen[0] < screen_width + size and -size <= wp_screen[1] < screen_height + size):
+                    continue
                 color = (0, 255, 0) if i == current_patrol_point else (0, 200, 0)
                 
                 pygame.draw.circle(
@@ -647,40 +716,47 @@ def run_movement_test():
                     wp_screen,
                     size
                 )
-                
-                # Draw lines connecting waypoints
-                if i > 0:
-                    prev_wp = ai_waypoints[i-1]
-                    prev_screen = (int(prev_wp[0] * scale), int(screen_height - prev_wp[1] * scale))
-                    pygame.draw.line(screen, (0, 200, 0), prev_screen, wp_screen, 1)
-        
-        # Calculate and display FPS
-        frame_count += 1
-        if time.time() - last_fps_update >= 1.0:
-            fps = frame_count
-            frame_count = 0
-            last_fps_update = time.time()
+            
+            # Connect the waypoints with a single polyline
+            if len(waypoint_screens) > 1:
+                pygame.draw.lines(screen, (0, 200, 0), False, waypoint_screens, 1)
         
-        fps_text = font.render(f"FPS: {fps}", True, (0, 0, 0))
-        screen.blit(fps_text, (10, 10))
+        # Display FPS as tracked by the clock
+        blit_text(screen, f"FPS: {int(clock.get_fps())}", (10, 10), (0, 0, 0), font, glyph_cache)
         
         # Draw player position text
-        pos_text = font.render(f"Pos: {player.location[0]:.2f}, {player.location[1]:.2f}, {player.location[2]:.2f}", True, (0, 0, 0))
-        screen.blit(pos_text, (10, 30))
+        blit_text(screen, f"Pos: {player.location[0]:.2f}, {player.location[1]:.2f}, {player.location[2]:.2f}", (10, 30), (0, 0, 0), font, glyph_cache)
         
         # Draw object hit message if active
         if object_hit_timer > 0 and object_hit_message:
-            msg_surface = font.render(object_hit_message, True, (255, 0, 0))
-            screen.blit(msg_surface, (10, 50))
+            blit_text(screen, object_hit_message, (10, 50), (255, 0, 0), font, glyph_cache)
             object_hit_timer -= 1
         
+        if headless:
+            # One physics step per frame, uncapped, for a fixed number of frames
+            clock.tick()
+            frame_time = FIXED_DT
+            frames_run += 1
+            if frames_run >= max_frames:
+                running = False
+            continue
+        
         # Update display
         pygame.display.flip()
         
-        # Cap frame rate
-        clock.tick(60)
+        # Measure the frame (capped only without vsync); the elapsed time drives next frame's physics steps
+        frame_time = clock.tick(frame_cap) / 1000.0
     
     pygame.quit()
 
+def main():
+    parser = argparse.ArgumentParser(description="Interactive 3D movement physics test")
+    parser.add_argument("--headless", action="store_true", help="Run without a window, for profiling")
+    parser.add_argument("--frames", type=int, default=600, help="Frames to run in headless mode")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the AI's random decisions")
+    
+    args = parser.parse_args()
+    run_movement_test(seed=args.seed, headless=args.headless, max_frames=args.frames)
+
 if __name__ == "__main__":
-    run_movement_test() 
\ No newline at end of file
+    main() 
\ No newline at end of file
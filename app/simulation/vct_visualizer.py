@@ -3,6 +3,7 @@ import sys
 import os
 import math
 import pygame
+from collections import defaultdict
 from typing import List, Dict, Tuple, Optional
 
 # Add the project root to the Python path
@@ -28,11 +29,15 @@ CYAN = (0, 255, 255)
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 FPS = 30
+# Frame rate while nothing on screen has changed; only events are handled
+IDLE_FPS = 10
 TEAM_BOX_WIDTH = 200
 TEAM_BOX_HEIGHT = 40
 BRACKET_PADDING = 50
 MATCH_SPACING = 20
 GROUP_SPACING = 150
+# Most rendered text surfaces kept for reuse across frames
+TEXT_CACHE_SIZE = 512
 
 class VCTVisualizer:
     """Visualizes VCT tournament data."""
@@ -52,9 +57,60 @@ class VCTVisualizer:
         self.font = pygame.font.SysFont(None, 24)
         self.title_font = pygame.font.SysFont(None, 36)
         self.small_font = pygame.font.SysFont(None, 18)
+        # Rendered text keyed by (font, text, color); most labels are identical frame to frame
+        self._text_cache: Dict[Tuple[int, str, Tuple[int, int, int]], pygame.Surface] = {}
+        # Team name labels keyed by id(team), rendered up front since names never change
+        self._team_labels: Dict[int, pygame.Surface] = {}
+        self._team_region_labels: Dict[int, pygame.Surface] = {}
+        for team in tournament.teams:
+            self.team_label(team)
+            self.team_label(team, with_region=True)
+        # Team box background, filled once in the display's pixel format
+        self.team_box_surface = pygame.Surface((TEAM_BOX_WIDTH, TEAM_BOX_HEIGHT)).convert()
+        self.team_box_surface.fill(LIGHT_GRAY)
+        # Group-stage groups with the matches they were computed from
+        self._groups: Optional[Tuple[List[Match], List[Tuple[str, List[Team], List[Match]]]]] = None
         
         # Clock for controlling frame rate
         self.clock = pygame.time.Clock()
+        
+        # Set when the window needs repainting; the tournament state drawn last
+        # is kept so data changes also trigger a redraw
+        self._dirty = True
+        self._drawn_state: Optional[tuple] = None
+    
+    def mark_dirty(self):
+        """Request a full redraw on the next frame."""
+        self._dirty = True
+    
+    def _tournament_state(self) -> tuple:
+        """Snapshot everything draw_tournament reads that can change between frames."""
+        return (
+            self.tournament.name,
+            tuple((id(m), id(m.winner), m.team1_score, m.team2_score) for m in self.tournament.matches),
+            tuple((id(t), t.wins, t.losses, self.tournament.standings.get(t)) for t in self.tournament.teams),
+        )
+    
+    def render_text(self, font: pygame.font.Font, text: str, color: Tuple[int, int, int]) -> pygame.Surface:
+        """Render antialiased text, reusing the surface from an earlier frame when possible."""
+        key = (id(font), text, color)
+        surface = self._text_cache.get(key)
+        if surface is None:
+            if len(self._text_cache) >= TEXT_CACHE_SIZE:
+                # Dicts keep insertion order, so this evicts the oldest entry
+                del self._text_cache[next(iter(self._text_cache))]
+            # Match the display's pixel format so every later blit takes the fast path
+            surface = self._text_cache[key] = font.render(text, True, color).convert_alpha()
+        return surface
+    
+    def team_label(self, team: Team, with_region: bool = False) -> pygame.Surface:
+        """Return a team's name label (optionally with its region), rendering it on first use."""
+        labels = self._team_region_labels if with_region else self._team_labels
+        surface = labels.get(id(team))
+        if surface is None:
+            text = f"{team.name} ({team.region})" if with_region else team.name
+            surface = labels[id(team)] = self.font.render(text, True, BLACK).convert_alpha()
+        return surface
     
     def run(self):
         """Run the visualization loop."""
@@ -68,19 +124,27 @@ class VCTVisualizer:
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         self.running = False
+                elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED):
+                    self._dirty = True
             
-            # Draw everything
-            self.screen.fill(WHITE)
-            self.draw_tournament()
-            pygame.display.flip()
-            self.clock.tick(FPS)
+            # Redraw only when the window was exposed or the tournament changed
+            state = self._tournament_state()
+            if self._dirty or state != self._drawn_state:
+                self.screen.fill(WHITE)
+                self.draw_tournament()
+                pygame.display.flip()
+                self._dirty = False
+                self._drawn_state = state
+                self.clock.tick(FPS)
+            else:
+                self.clock.tick(IDLE_FPS)
         
         pygame.quit()
     
     def draw_tournament(self):
         """Draw the tournament visualization."""
         # Draw tournament title
-        title_text = self.title_font.render(self.tournament.name, True, BLACK)
+        title_text = self.render_text(self.title_font, self.tournament.name, BLACK)
         title_rect = title_text.get_rect(centerx=SCREEN_WIDTH//2, y=20)
         self.screen.blit(title_text, title_rect)
         
@@ -108,88 +172,117 @@ class VCTVisualizer:
     def draw_group_stage(self, matches: List[Match]):
         """Draw the group stage matches."""
         # Draw section title
-        title_text = self.title_font.render("Group Stage", True, BLACK)
+        title_text = self.render_text(self.title_font, "Group Stage", BLACK)
         title_rect = title_text.get_rect(x=50, y=80)
         self.screen.blit(title_text, title_rect)
         
-        # Group teams to identify groups
-        teams_by_group: Dict[str, List[Team]] = {}
-        
-        # Simplified grouping - just use first matches to determine groups
-        for match in matches:
-            # Create a unique group ID based on the teams in the first few matches
-            for team in [match.team1, match.team2]:
-                found = False
-                for group_id, group_teams in teams_by_group.items():
-                    if team in group_teams:
-                        found = True
-                        break
-                
-                if not found:
-                    # Try to find a group with shared opponents
-                    for group_id, group_teams in teams_by_group.items():
-                        for existing_team in group_teams:
-                            # Check if this team plays against any team in existing groups
-                            for m in matches:
-                                if ((m.team1 == team and m.team2 == existing_team) or
-                                    (m.team2 == team and m.team1 == existing_team)):
-                                    teams_by_group[group_id].append(team)
-                                    found = True
-                                    break
-                            if found:
-                                break
-                        if found:
-                            break
-                    
-                    if not found:
-                        # Create a new group
-                        new_group_id = f"Group {len(teams_by_group) + 1}"
-                        teams_by_group[new_group_id] = [team]
+        # Groups only change with the match list, so they are computed once and reused
+        groups = self._group_stage_groups(matches)
         
-        # Now draw each group
+        # Now draw each group, collecting the text blits and issuing them in one call.
+        # Rows only move down, so drawing stops at the first one below the screen.
+        blit_list = []
         group_y = 120
-        for group_id, teams in teams_by_group.items():
+        for group_id, teams, group_matches in groups:
+            if group_y >= SCREEN_HEIGHT:
+                break
             # Draw group header
-            group_text = self.font.render(group_id, True, BLACK)
-            self.screen.blit(group_text, (50, group_y))
+            group_text = self.render_text(self.font, group_id, BLACK)
+            blit_list.append((group_text, (50, group_y)))
             
             # Draw teams in this group
             team_y = group_y + 30
             for team in teams:
-                team_text = self.font.render(f"{team.name} ({team.region})", True, BLACK)
-                wins_text = self.font.render(f"W: {team.wins} L: {team.losses}", True, BLACK)
+                if team_y >= SCREEN_HEIGHT:
+                    break
+                team_text = self.team_label(team, with_region=True)
+                wins_text = self.render_text(self.font, f"W: {team.wins} L: {team.losses}", BLACK)
                 
-                self.screen.blit(team_text, (70, team_y))
-                self.screen.blit(wins_text, (300, team_y))
+                blit_list.append((team_text, (70, team_y)))
+                blit_list.append((wins_text, (300, team_y)))
                 team_y += 25
             
             # Draw matches for this group
             match_y = team_y + 10
-            group_matches = [m for m in matches if m.team1 in teams or m.team2 in teams]
             for match in group_matches:
+                if match_y >= SCREEN_HEIGHT:
+                    break
                 # Draw match details
-                match_text = self.small_font.render(
+                match_text = self.render_text(
+                    self.small_font,
                     f"{match.team1.name} vs {match.team2.name} - {match.map_name}", 
-                    True, BLACK
+                    BLACK
                 )
-                self.screen.blit(match_text, (70, match_y))
+                blit_list.append((match_text, (70, match_y)))
                 
                 # Draw match result if available
                 if match.winner:
-                    result_text = self.small_font.render(
+                    result_text = self.render_text(
+                        self.small_font,
                         f"{match.team1_score} - {match.team2_score} (Winner: {match.winner.name})",
-                        True, BLUE
+                        BLUE
                     )
-                    self.screen.blit(result_text, (350, match_y))
+                    blit_list.append((result_text, (350, match_y)))
                 
                 match_y += 20
             
             group_y = match_y + GROUP_SPACING
+        self.screen.blits(blit_list, doreturn=False)
+    
+    def _group_stage_groups(self, matches: List[Match]) -> List[Tuple[str, List[Team], List[Match]]]:
+        """
+        Split group-stage teams into groups of teams connected by matches.
+        
+        Teams are merged with a disjoint-set union over the matches. Groups and
+        the teams within them keep the order in which teams first appear. The
+        result is cached until a different list of matches is passed in.
+        
+        Returns:
+            (group_id, teams, matches involving those teams) per group
+        """
+        if self._groups is not None:
+            cached_matches, groups = self._groups
+            if len(cached_matches) == len(matches) and all(a is b for a, b in zip(cached_matches, matches)):
+                return groups
+        
+        parent: Dict[int, int] = {}
+        teams_by_id: Dict[int, Team] = {}
+        
+        def find(key: int) -> int:
+            while parent[key] != key:
+                # Path halving keeps the trees flat
+                parent[key] = parent[parent[key]]
+                key = parent[key]
+            return key
+        
+        for match in matches:
+            for team in (match.team1, match.team2):
+                if id(team) not in parent:
+                    parent[id(team)] = id(team)
+                    teams_by_id[id(team)] = team
+            root1, root2 = find(id(match.team1)), find(id(match.team2))
+            if root1 != root2:
+                parent[root2] = root1
+        
+        teams_by_root: Dict[int, List[Team]] = defaultdict(list)
+        for key, team in teams_by_id.items():
+            teams_by_root[find(key)].append(team)
+        
+        # Both teams of a match share a root, so one pass files every match under its group
+        matches_by_root: Dict[int, List[Match]] = defaultdict(list)
+        for match in matches:
+            matches_by_root[find(id(match.team1))].append(match)
+        
+        groups = []
+        for number, (root, teams) in enumerate(teams_by_root.items(), 1):
+            groups.append((f"Group {number}", teams, matches_by_root[root]))
+        self._groups = (list(matches), groups)
+        return groups
     
     def draw_playoffs(self, matches: List[Match]):
         """Draw the playoff bracket."""
         # Draw section title
-        title_text = self.title_font.render("Playoffs", True, BLACK)
+        title_text = self.render_text(self.title_font, "Playoffs", BLACK)
         title_rect = title_text.get_rect(x=SCREEN_WIDTH//2, y=80)
         self.screen.blit(title_text, title_rect)
         
@@ -200,13 +293,19 @@ class VCTVisualizer:
         
         for i, match in enumerate(matches):
             match_x = start_x + i * (TEAM_BOX_WIDTH + MATCH_SPACING)
+            # Skip brackets entirely off either side of the screen (the winner outline
+            # extends 5px past the boxes)
+            if match_x + TEAM_BOX_WIDTH + 5 <= 0:
+                continue
+            if match_x - 5 >= SCREEN_WIDTH:
+                break
             
             # Draw team boxes
             self.draw_team_box(match.team1, match_x, start_y, match.team1_score)
             self.draw_team_box(match.team2, match_x, start_y + TEAM_BOX_HEIGHT + 10, match.team2_score)
             
             # Draw map name
-            map_text = self.small_font.render(match.map_name, True, BLACK)
+            map_text = self.render_text(self.small_font, match.map_name, BLACK)
             map_rect = map_text.get_rect(centerx=match_x + TEAM_BOX_WIDTH//2, y=start_y + 2*TEAM_BOX_HEIGHT + 15)
             self.screen.blit(map_text, map_rect)
             
@@ -223,46 +322,46 @@ class VCTVisualizer:
     def draw_team_box(self, team: Team, x: int, y: int, score: int = 0):
         """Draw a box for a team with their information."""
         # Draw box
-        pygame.draw.rect(
-            self.screen,
-            LIGHT_GRAY,
-            (x, y, TEAM_BOX_WIDTH, TEAM_BOX_HEIGHT)
-        )
+        self.screen.blit(self.team_box_surface, (x, y))
         
         # Draw team name
-        team_text = self.font.render(team.name, True, BLACK)
+        team_text = self.team_label(team)
         team_rect = team_text.get_rect(x=x+5, centery=y+TEAM_BOX_HEIGHT//2)
         self.screen.blit(team_text, team_rect)
         
         # Draw score if available
         if score > 0:
-            score_text = self.font.render(str(score), True, BLACK)
+            score_text = self.render_text(self.font, str(score), BLACK)
             score_rect = score_text.get_rect(right=x+TEAM_BOX_WIDTH-5, centery=y+TEAM_BOX_HEIGHT//2)
             self.screen.blit(score_text, score_rect)
     
     def draw_standings(self):
         """Draw the tournament standings."""
         # Draw section title
-        title_text = self.title_font.render("Standings", True, BLACK)
+        title_text = self.render_text(self.title_font, "Standings", BLACK)
         title_rect = title_text.get_rect(x=SCREEN_WIDTH - 300, y=80)
         self.screen.blit(title_text, title_rect)
         
-        # Sort teams by ranking
-        sorted_teams = sorted(
-            self.tournament.teams,
-            key=lambda team: self.tournament.standings.get(team, 999) 
-        )
+        # Look each rank up once and sort by it; unranked teams go last
+        standings = self.tournament.standings
+        ranked_teams = [(standings.get(team), team) for team in self.tournament.teams]
+        ranked_teams.sort(key=lambda entry: 999 if entry[0] is None else entry[0])
         
-        # Draw each team's standing
+        # Draw each team's standing, collecting the text blits and issuing them in one call
+        blit_list = []
         standing_y = 130
-        for team in sorted_teams:
-            rank = self.tournament.standings.get(team, "?")
-            team_text = self.font.render(f"{rank}. {team.name}", True, BLACK)
-            record_text = self.font.render(f"W-L: {team.wins}-{team.losses}", True, BLACK)
+        for rank, team in ranked_teams:
+            if standing_y >= SCREEN_HEIGHT:
+                break
+            if rank is None:
+                rank = "?"
+            team_text = self.render_text(self.font, f"{rank}. {team.name}", BLACK)
+            record_text = self.render_text(self.font, f"W-L: {team.wins}-{team.losses}", BLACK)
             
-            self.screen.blit(team_text, (SCREEN_WIDTH - 300, standing_y))
-            self.screen.blit(record_text, (SCREEN_WIDTH - 150, standing_y))
+            blit_list.append((team_text, (SCREEN_WIDTH - 300, standing_y)))
+            blit_list.append((record_text, (SCREEN_WIDTH - 150, standing_y)))
             standing_y += 30
+        self.screen.blits(blit_list, doreturn=False)
 
 def visualize_tournament(tournament: Tournament):
     """Create and run a visualizer for the tournament."""
@@ -1,6 +1,6 @@
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -15,18 +15,40 @@ engine = create_engine(
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Sessions join the test's outer transaction through SAVEPOINTs, so commits made
+# by the API are rolled back with it
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False,
+                                   join_transaction_mode="create_savepoint")
 
-@pytest.fixture(scope="function")
-def db():
-    """Create a fresh database for each test."""
+# pysqlite manages transactions itself and breaks SAVEPOINT; let SQLAlchemy
+# emit BEGIN instead
+@event.listens_for(engine, "connect")
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+@event.listens_for(engine, "begin")
+def _emit_begin(connection):
+    connection.exec_driver_sql("BEGIN")
+
+@pytest.fixture(scope="session")
+def _schema():
+    """Create the schema once for the whole test session."""
     Base.metadata.create_all(bind=engine)
-    db = TestingSessionLocal()
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture(scope="function")
+def db(_schema):
+    """Give each test a session whose changes are rolled back afterwards."""
+    connection = _schema.connect()
+    transaction = connection.begin()
+    db = TestingSessionLocal(bind=connection)
     try:
         yield db
     finally:
         db.close()
-        Base.metadata.drop_all(bind=engine)
+        transaction.rollback()
+        connection.close()
 
 @pytest.fixture(scope="function")
 def client(db):
@@ -41,40 +63,34 @@ def client(db):
         yield test_client
     app.dependency_overrides.clear()
 
+# Stats shared by every player in sample_match_data
+SAMPLE_PLAYER = {
+    "aim_rating": 75.0,
+    "reaction_time": 180.0,
+    "movement_accuracy": 0.8,
+    "spray_control": 0.7,
+    "clutch_iq": 0.6
+}
+SAMPLE_AGENT_ASSIGNMENTS = {
+    "A1": "Jett",
+    "B1": "Sage"
+}
+
 @pytest.fixture
 def sample_match_data():
+    # Tests mutate the payload, so each gets fresh dicts; copying the flat
+    # templates is far cheaper than deep-copying a prebuilt payload
     return {
         "team_a": {
             "name": "Test Team A",
-            "players": [
-                {
-                    "aim_rating": 75.0,
-                    "reaction_time": 180.0,
-                    "movement_accuracy": 0.8,
-                    "spray_control": 0.7,
-                    "clutch_iq": 0.6
-                }
-                for _ in range(5)
-            ]
+            "players": [dict(SAMPLE_PLAYER) for _ in range(5)]
         },
         "team_b": {
             "name": "Test Team B",
-            "players": [
-                {
-                    "aim_rating": 75.0,
-                    "reaction_time": 180.0,
-                    "movement_accuracy": 0.8,
-                    "spray_control": 0.7,
-                    "clutch_iq": 0.6
-                }
-                for _ in range(5)
-            ]
+            "players": [dict(SAMPLE_PLAYER) for _ in range(5)]
         },
         "map_name": "ascent",
-        "agent_assignments": {
-            "A1": "Jett",
-            "B1": "Sage"
-        }
+        "agent_assignments": dict(SAMPLE_AGENT_ASSIGNMENTS)
     }
 
 @pytest.fixture
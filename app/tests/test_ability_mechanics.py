@@ -2,7 +2,7 @@ import pytest
 import math
 from app.simulation.models.ability import (
     AbilityType, AbilityDefinition, AbilityTarget,
-    STANDARD_ABILITIES, MollyAbilityInstance
+    FLASH_DEF, SMOKE_DEF, MollyAbilityInstance
 )
 from app.simulation.models.map import Map
 class MockPlayer:
@@ -21,12 +21,10 @@ class MockPlayer:
 
     def apply_damage(self, dmg: int):
         """Apply damage to player's health and armor."""
-        # Armor absorbs 66% of damage
-        if self.armor > 0:
-            armor_damage = min(self.armor, int(dmg * 0.5))
-            self.armor = max(0, self.armor - armor_damage)
-            dmg = max(0, dmg - armor_damage)
-        self.health = max(0, self.health - dmg)
+        # Armor absorbs half the damage while it lasts; with no armor left it absorbs nothing
+        armor_damage = min(self.armor, int(dmg * 0.5))
+        self.armor -= armor_damage
+        self.health = max(0, self.health - (dmg - armor_damage))
 
 
 
@@ -62,7 +60,7 @@ def mock_map():
 
 def test_ability_definition_initialization():
     """Test ability definition initialization and defaults."""
-    flash = STANDARD_ABILITIES["flash"]
+    flash = FLASH_DEF
     assert flash.ability_type == AbilityType.FLASH
     assert flash.max_charges == 2
     assert flash.credit_cost == 200
@@ -75,7 +73,7 @@ def test_ability_definition_initialization():
 
 def test_ability_instance_creation():
     """Test ability instance creation and initial state."""
-    flash_def = STANDARD_ABILITIES["flash"]
+    flash_def = FLASH_DEF
     instance = flash_def.create_instance("player1")
     
     assert instance.charges_remaining == flash_def.max_charges
@@ -85,7 +83,7 @@ def test_ability_instance_creation():
 
 def test_flash_mechanics(mock_players, mock_map):
     """Test flash ability mechanics and player effects."""
-    flash_def = STANDARD_ABILITIES["flash"]
+    flash_def = FLASH_DEF
     instance = flash_def.create_instance("player1")
     
     # Set up player positions and view directions
@@ -153,7 +151,7 @@ def test_flash_mechanics(mock_players, mock_map):
 
 def test_smoke_mechanics(mock_players):
     """Test smoke ability mechanics and area effects."""
-    smoke_def = STANDARD_ABILITIES["smoke"]
+    smoke_def = SMOKE_DEF
     instance = smoke_def.create_instance("player1")
     
     # Set up player positions
@@ -247,7 +245,7 @@ def test_molly_mechanics():
 
 def test_ability_duration_and_expiration():
     """Test ability duration tracking and expiration."""
-    smoke_def = STANDARD_ABILITIES["smoke"]
+    smoke_def = SMOKE_DEF
     instance = smoke_def.create_instance("player1")
     
     # Activate smoke
@@ -268,7 +266,7 @@ def test_ability_duration_and_expiration():
 
 def test_bounce_mechanics(mock_map):
     """Test ability bounce mechanics."""
-    flash_def = STANDARD_ABILITIES["flash"]
+    flash_def = FLASH_DEF
     instance = flash_def.create_instance("player1")
     
     # Activate flash with bounce
@@ -3,32 +3,37 @@ from app.simulation.ai.agents.base import BaseAgent, AgentConfig
 from app.simulation.ai.agents.greedy import GreedyAgent
 from app.simulation.ai.inference.agent_pool import AgentPool
 
+# Scalar fields of a minimal observation; the list and dict fields are added by
+# create_minimal_observation so no two observations share them
+BASE_OBSERVATION = {
+    'alive': True,
+    'phase': 'round',
+    'location': (0, 0, 0),
+    'direction': 0.0,
+    'health': 100,
+    'armor': 0,
+    'is_walking': False,
+    'is_crouching': False,
+    'is_jumping': False,
+    'ground_contact': True,
+    'creds': 0,
+    'weapon': None,
+    'shield': None,
+    'spike': False,
+    'at_plant_site': False,
+    'spike_planted': False,
+    'at_spike': False
+}
+
 def create_minimal_observation(phase='round', **kwargs) -> dict:
     """Create a minimal valid observation dictionary."""
-    obs = {
-        'alive': True,
-        'phase': phase,
-        'location': (0, 0, 0),
-        'direction': 0.0,
-        'health': 100,
-        'armor': 0,
-        'is_walking': False,
-        'is_crouching': False,
-        'is_jumping': False,
-        'ground_contact': True,
-        'creds': 0,
-        'weapon': None,
-        'shield': None,
-        'spike': False,
-        'visible_enemies': [],
-        'heard_sounds': [],
-        'status_effects': [],
-        'utility_charges': {},
-        'utility_cooldowns': {},
-        'at_plant_site': False,
-        'spike_planted': False,
-        'at_spike': False
-    }
+    obs = BASE_OBSERVATION.copy()
+    obs['phase'] = phase
+    obs['visible_enemies'] = []
+    obs['heard_sounds'] = []
+    obs['status_effects'] = []
+    obs['utility_charges'] = {}
+    obs['utility_cooldowns'] = {}
     obs.update(kwargs)
     return obs
 
@@ -142,6 +147,19 @@ def test_agent_pool_management():
     # Reset all agents
     pool.reset_all()
 
+def test_agent_pool_reuse_across_skill_buckets():
+    """Test that agent reuse depends on the 0.1 skill window, not the skill bucket."""
+    pool = AgentPool()
+    agent = pool.get_agent('duelist', 0.8, 'greedy')
+
+    # Neighbouring bucket, still within 0.1 of the existing agent
+    assert pool.get_agent('duelist', 0.71, 'greedy') is agent
+    assert pool.get_agent('duelist', 0.89, 'greedy') is agent
+
+    # Outside the window creates a new agent
+    assert pool.get_agent('duelist', 0.65, 'greedy') is not agent
+    assert len(pool.agents['duelist']) == 2
+
 def test_agent_personality_influence():
     """Test that agent personality affects decision making."""
     # Create aggressive agent
@@ -231,4 +249,21 @@ def test_agent_pool_config_loading():
     
     # Clean up
     import os
-    os.unlink(config_path) 
\ No newline at end of file
+    os.unlink(config_path) 
+
+def test_agent_pool_config_reloads_when_file_changes(tmp_path):
+    """Test that a cached config is re-read once the file changes on disk."""
+    import json
+    
+    config_path = tmp_path / "agents.json"
+    config_path.write_text(json.dumps({"default_personalities": {"duelist": {"aggression": 0.8}}}))
+    assert AgentPool(config_path=str(config_path)).default_personalities['duelist']['aggression'] == 0.8
+    
+    config_path.write_text(json.dumps({"default_personalities": {"duelist": {"aggression": 0.25}}}))
+    assert AgentPool(config_path=str(config_path)).default_personalities['duelist']['aggression'] == 0.25
+    
+    # The stale entry is replaced rather than kept alongside the new one
+    from app.simulation.ai.inference.agent_pool import _config_cache
+    entries = [entry for path, entry in _config_cache.items() if path.startswith(str(tmp_path))]
+    assert len(entries) == 1
+    assert entries[0][2]["default_personalities"]["duelist"]["aggression"] == 0.25
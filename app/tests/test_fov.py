@@ -147,5 +147,17 @@ class TestFieldOfVision(unittest.TestCase):
         expected_visible = ["p2"]  # Only player2 should be visible (player3 is behind wall)
         self.assertEqual(self.player1.visible_enemies, expected_visible)
 
+    def test_view_direction_follows_direction(self):
+        """Test that the cached view vector is refreshed when direction changes."""
+        vx, vy, vz = self.player2.view_direction
+        self.assertAlmostEqual(vx, -1.0)
+        self.assertAlmostEqual(vy, 0.0)
+        self.assertEqual(vz, 0.0)
+
+        self.player2.direction = 90
+        vx, vy, vz = self.player2.view_direction
+        self.assertAlmostEqual(vx, 0.0)
+        self.assertAlmostEqual(vy, 1.0)
+
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
@@ -22,8 +22,8 @@ def test_full_valorant_game_simulation():
     print(os.getcwd())
     map_data = load(open("/Users/aidankosik/workspace/vct-simulator/maps/ascent.map.json"))
 
-    # 2. Create a Map object
-    game_map = Map.from_json("/Users/aidankosik/workspace/vct-simulator/maps/ascent.map.json")
+    # 2. Create a Map object from the data loaded above
+    game_map = Map.from_json(map_data)
 
     # Get weapon catalog
     weapon_catalog = WeaponFactory.create_weapon_catalog()
@@ -2,8 +2,9 @@ import pytest
 from app.simulation.models.map import Map
 from app.simulation.models.map_pathfinding import NavigationMesh, CollisionDetector
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_map():
+    """Build the test map once per module; the tests below only read from it."""
     test_map = Map("test_map", 100, 100)
     test_map_json = {
         "metadata": {
@@ -73,6 +74,15 @@ def mock_map():
     
     return test_map
 
+@pytest.fixture(autouse=True)
+def mock_map_unchanged(mock_map):
+    """Fail any test that mutates the shared navigation grids."""
+    walkable = mock_map.nav_mesh.walkable.tobytes()
+    elevation = mock_map.nav_mesh.elevation.tobytes()
+    yield
+    assert mock_map.nav_mesh.walkable.tobytes() == walkable, "test mutated the shared walkable grid"
+    assert mock_map.nav_mesh.elevation.tobytes() == elevation, "test mutated the shared elevation grid"
+
 class TestNavigationMesh:
     def test_initialization(self, mock_map):
         assert mock_map.nav_mesh.width == 100
@@ -195,6 +205,14 @@ class TestCollisionDetector:
             (55, 41, 1)   # After wall
         )
 
+    def test_ray_clipping_cell_corner(self):
+        # The segment only clips the corner of the blocked cell (5, 5)
+        nav_mesh = NavigationMesh(10, 10)
+        nav_mesh.walkable[5, 5] = False
+        detector = CollisionDetector(nav_mesh)
+        assert detector.check_collision((4.5, 5.8, 0), (5.8, 4.5, 0))
+        assert not detector.check_collision((4.0, 5.6, 0), (5.6, 4.0, 0))
+
 def test_create_navigation_mesh(mock_map):
     assert isinstance(mock_map.nav_mesh, NavigationMesh)
     assert mock_map.collision_detector is not None
@@ -1,6 +1,6 @@
 import pytest
-from app.simulation.test_movement import create_test_map
-from app.simulation.models.map import RampBoundary, StairsBoundary
+from app.simulation.test_movement import compute_ai_move, create_test_map
+from app.simulation.models.map import MapBoundary, RampBoundary, SpatialGrid, StairsBoundary
 from app.simulation.models.player import Player
 
 
@@ -62,6 +62,155 @@ def test_map_elevation_and_can_move_with_ramp_and_area():
     assert game_map.can_move(*start_flat, *end_heaven) is False
 
 
+def test_vectorized_elevation_matches_scalar_lookup():
+    game_map = create_test_map()
+    # Sample every half unit, covering areas, walls, boxes, the ramp and the stairs
+    points = [(x * 0.5, y * 0.5) for x in range(66) for y in range(66)]
+    xs, ys = zip(*points)
+    elevations = game_map.get_elevations_at_positions(xs, ys)
+    expected = [game_map.get_elevation_at_position(x, y) for x, y in points]
+    assert list(elevations) == pytest.approx(expected)
+
+
+def test_elevation_grid_matches_scalar_lookup_at_grid_points():
+    game_map = create_test_map()
+    grid = game_map.get_elevation_grid()
+    assert grid.shape == (game_map.width, game_map.height)
+    for x in range(game_map.width):
+        for y in range(game_map.height):
+            assert grid[x, y] == game_map.get_elevation_at_position(x, y)
+
+
+def test_spatial_grid_returns_only_nearby_boundaries():
+    near = MapBoundary(1, 1, 2, 2, "object", "near")
+    wide = MapBoundary(0, 0, 10, 1, "wall", "wide")
+    far = MapBoundary(20, 20, 1, 1, "object", "far")
+    grid = SpatialGrid([near, wide, far], cell_size=2.0)
+    # Point query keeps insertion order and includes boundaries touching the cell
+    assert grid.query(1.5, 0.5) == [near, wide]
+    assert grid.query(20.5, 20.5) == [far]
+    assert grid.query(12.0, 12.0) == []
+    # Rectangle query spanning several cells returns each boundary once
+    hits = grid.query_rect(0.0, 0.0, 9.0, 3.0)
+    assert len(hits) == 2 and set(hits) == {near, wide}
+
+
+def test_surface_masks_mark_stair_and_ramp_grid_points():
+    game_map = create_test_map()
+    masks = game_map.get_surface_masks()
+    width = game_map.width
+    # stairs-1 spans x=22..24, y=12..16 with edges included
+    assert masks["stairs"][12 * width + 22] and masks["stairs"][16 * width + 24]
+    assert not masks["stairs"][11 * width + 22]
+    # ramp-to-heaven spans x=18..20, y=16..20
+    assert masks["ramps"][18 * width + 19]
+    assert not masks["ramps"][18 * width + 21]
+
+
+def test_walkable_mask_matches_is_valid_position_on_terrain():
+    game_map = create_test_map()
+    mask = game_map.get_walkable_mask()
+    grid = game_map.get_elevation_grid()
+    width = game_map.width
+    for x in range(width):
+        for y in range(game_map.height):
+            assert bool(mask[y * width + x]) == game_map.is_valid_position(x, y, grid[x, y])
+    # box-1 covers (10..12, 10..12); open floor at (7, 7)
+    assert not mask[11 * width + 11]
+    assert mask[7 * width + 7]
+
+
+def test_neighbor_table_lists_in_bounds_walkable_neighbors():
+    game_map = create_test_map()
+    mask = game_map.get_walkable_mask()
+    grid = game_map.get_elevation_grid()
+    table = game_map.get_neighbor_table()
+    width, height = game_map.width, game_map.height
+
+    def walkable(x, y):
+        return 0 <= x < width and 0 <= y < height and bool(mask[y * width + x])
+
+    for x in range(width):
+        for y in range(height):
+            expected = [
+                (x + dx, y + dy)
+                for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (1, 1), (-1, 1), (1, -1))
+                # Diagonals must not squeeze past a blocked cardinal cell
+                if walkable(x + dx, y + dy) and (not (dx and dy) or walkable(x + dx, y) and walkable(x, y + dy))
+            ]
+            entries = table[y * width + x]
+            assert [(nx, ny) for nx, ny, _, _ in entries] == expected
+            for nx, ny, elevation, _ in entries:
+                assert elevation == grid[nx, ny]
+
+
+def test_find_path_walks_cardinal_steps_around_obstacles():
+    game_map = create_test_map()
+    path = game_map.find_path((7.5, 11.5), (14.5, 11.5))
+    assert path[0] == (7.5, 11.5)
+    assert path[-1] == (14.5, 11.5)
+    for (x0, y0), (x1, y1) in zip(path, path[1:]):
+        assert abs(x1 - x0) + abs(y1 - y0) == 1
+    # box-1 covers (10..12, 10..12), so the straight 7-step route is blocked
+    assert len(path) > 8
+    assert game_map.find_path((7.5, 11.5), (7.9, 11.1)) == [(7.5, 11.5)]
+
+
+def test_find_path_3d_takes_shortest_route_on_open_ground():
+    game_map = create_test_map()
+    path = game_map.find_path_3d((6.5, 6.5, 0.0), (12.5, 8.5, 0.0))
+    assert path[0] == (6.5, 6.5, 0.0)
+    assert path[-1] == (12.5, 8.5, 0.0)
+    # Octile-optimal: two diagonal and four straight steps
+    assert len(path) == 7
+    for (x0, y0, _), (x1, y1, _) in zip(path, path[1:]):
+        assert max(abs(x1 - x0), abs(y1 - y0)) == 1
+
+
+def test_find_path_3d_reuses_cached_paths():
+    game_map = create_test_map()
+    first = game_map.find_path_3d((6.5, 6.5, 0.0), (12.5, 8.5, 0.0))
+    # Callers get their own list, so editing it does not leak into the cache
+    first.pop()
+    second = game_map.find_path_3d((6.5, 6.5, 0.0), (12.5, 8.5, 0.0))
+    assert len(second) == len(first) + 1
+    # Adding geometry invalidates cached paths
+    game_map.objects["blocker"] = MapBoundary(8, 6, 1, 4, "object", "blocker", z=0, height_z=2.0)
+    rerouted = game_map.find_path_3d((6.5, 6.5, 0.0), (12.5, 8.5, 0.0))
+    assert rerouted != second
+
+
+def test_elevation_lookups_are_memoized_until_geometry_changes():
+    game_map = create_test_map()
+    assert game_map.get_elevation_at_position(5, 5) == 0.0
+    assert game_map.get_elevation_at_position(5, 5) == 0.0
+    # Only whole-number points are kept
+    assert game_map.get_elevation_at_position(5.5, 5.5) == 0.0
+    assert list(game_map._cached_geometry("elevation_cache", dict)) == [(5, 5)]
+    game_map.add_boundary(MapBoundary(5, 5, 1, 1, "object", "crate", z=2.0, height_z=1.0))
+    assert game_map.get_elevation_at_position(5, 5) == 2.0
+    assert game_map.get_elevation_at_position(5.5, 5.5) == 2.0
+
+
+def test_readding_a_boundary_under_the_same_name_refreshes_geometry():
+    game_map = create_test_map()
+    game_map.add_boundary(MapBoundary(6, 6, 1, 1, "wall", "moved", z=0, height_z=3.0))
+    assert game_map.is_valid_position(6.5, 6.5, 0.0) is False
+    # Same name, so the wall count is unchanged
+    game_map.add_boundary(MapBoundary(12, 6, 1, 1, "wall", "moved", z=0, height_z=3.0))
+    assert game_map.is_valid_position(6.5, 6.5, 0.0) is True
+    assert game_map.is_valid_position(12.5, 6.5, 0.0) is False
+
+
+def test_find_path_3d_redirects_blocked_goal_to_nearest_valid_cell():
+    game_map = create_test_map()
+    # (11, 11) is inside box-1; the closest free cells are two steps away
+    path = game_map.find_path_3d((6.5, 6.5, 0.0), (11.5, 11.5, 0.0))
+    end_x, end_y, end_z = path[-1]
+    assert max(abs(end_x - 11.5), abs(end_y - 11.5)) == 2
+    assert game_map.is_valid_position(int(end_x), int(end_y), end_z)
+
+
 def test_collision_with_object_blocks_movement():
     game_map = create_test_map()
     # box-1 sits at (10,10) footprint 2x2, height_z=1.0
@@ -117,3 +266,57 @@ def test_cast_bullet_misses_everything_returns_max_range():
     assert hit_pt == pytest.approx(expected_pt)
     assert hit_boundary is None
     assert hit_player is None
+
+
+def test_compute_ai_move_normalizes_direction_and_jumps_small_steps():
+    game_map = create_test_map()
+    ai = Player(
+        id="ai", name="AI", team_id="", role="", agent="",
+        aim_rating=0.0, reaction_time=0.0, movement_accuracy=0.0,
+        spray_control=0.0, clutch_iq=0.0,
+        location=(7.5, 7.5, 0.0)
+    )
+    dx, dy, jump = compute_ai_move(ai, 10.5, 11.5, 0.0, game_map)
+    assert dx == pytest.approx(0.6)
+    assert dy == pytest.approx(0.8)
+    assert not jump
+    assert compute_ai_move(ai, 10.5, 11.5, 1.0, game_map)[2]
+    # Steps too tall to jump, and any step while airborne, do not trigger a jump
+    assert not compute_ai_move(ai, 10.5, 11.5, 3.0, game_map)[2]
+    # Off the grid there is no stair or ramp to consult, so small steps still jump
+    ai.location = (7.5, game_map.height + 0.5, 0.0)
+    assert compute_ai_move(ai, 10.5, 11.5, 1.0, game_map)[2]
+    ai.location = (7.5, 7.5, 0.0)
+    ai.ground_contact = False
+    assert not compute_ai_move(ai, 10.5, 11.5, 1.0, game_map)[2]
+
+
+def test_find_path_3d_search_state_stays_bounded_on_ramp_maps():
+    import tracemalloc
+    from app.simulation.models.map import Map
+
+    ramps = {
+        f"ramp-{i}": {"x": 10 + 16 * i, "y": 20, "w": 8, "h": 60, "z_start": 0.0,
+                      "z_end": 0.5 + 0.4 * i, "direction": "north"}
+        for i in range(6)
+    }
+    game_map = Map.from_json({
+        "metadata": {"name": "ramps", "map-size": [120, 120]},
+        "map-areas": {"ground": {"x": 0, "y": 0, "w": 120, "h": 120, "z": 0}},
+        "ramps": ramps,
+    })
+    # Every ramp row adds its own elevations to the grid
+    assert len(set(game_map.get_elevation_grid().ravel().tolist())) > 100
+    # Warm the geometry caches so only the search itself is measured
+    game_map.find_path_3d((2.5, 2.5, 0.0), (3.5, 3.5, 0.0))
+
+    tracemalloc.start()
+    try:
+        path = game_map.find_path_3d((2.5, 2.5, 0.0), (115.5, 110.5, 0.0))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert path[0] == (2.5, 2.5, 0.0)
+    assert path[-1] == (115.5, 110.5, 0.0)
+    # Search state is keyed per cell, not per (cell, elevation)
+    assert peak < 2_000_000
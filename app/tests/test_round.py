@@ -613,4 +613,19 @@ def test_spike_defuse_ends_round(mock_map):
         defender.location = (5.0, 5.0, 0.0)
     assert round_obj.round_winner == RoundWinner.DEFENDERS
     assert round_obj.round_end_condition == RoundEndCondition.SPIKE_DEFUSED
-    assert round_obj.phase == RoundPhase.END 
\ No newline at end of file
+    assert round_obj.phase == RoundPhase.END 
+
+def test_line_of_sight_reuses_result_for_same_positions(mock_players, mock_map):
+    players, attacker_ids, defender_ids = mock_players
+    round_obj = make_round(players, attacker_ids, defender_ids, map_obj=mock_map)
+    raycasts = []
+    original_raycast = mock_map.raycast
+    mock_map.raycast = lambda *args, **kwargs: raycasts.append(args) or original_raycast(*args, **kwargs)
+    try:
+        # wall1 spans x 40-60 at y 40-42
+        assert not round_obj._has_line_of_sight((50, 35, 0), (50, 45, 0))
+        assert not round_obj._has_line_of_sight((50, 35, 0), (50, 45, 0))
+        assert round_obj._has_line_of_sight((30, 35, 0), (30, 45, 0))
+    finally:
+        del mock_map.raycast
+    assert len(raycasts) == 2
@@ -12,6 +12,21 @@ def test_round_progression(client, created_match):
         assert data["winner"] in ["attackers", "defenders"]
         assert data["end_condition"] in ["elimination", "spike_detonation", "spike_defused", "time_expired"]
 
+def test_round_batch(client, created_match):
+    """Test that several rounds can be simulated in one request."""
+    response = client.post(f"/matches/{created_match}/rounds/batch", params={"n": 3})
+    assert response.status_code == 200
+    data = response.json()
+    assert [round_data["round_number"] for round_data in data] == [1, 2, 3]
+
+    # The next single round continues from the batch
+    response = client.post(f"/matches/{created_match}/rounds/next")
+    assert response.json()["round_number"] == 4
+
+    # Batch size is bounded and the match must exist
+    assert client.post(f"/matches/{created_match}/rounds/batch", params={"n": 0}).status_code == 422
+    assert client.post("/matches/missing/rounds/batch", params={"n": 1}).status_code == 404
+
 def test_round_state_tracking(client, created_match):
     """Test that round state is tracked correctly."""
     # Simulate a round